@@ -1,5 +1,11 @@
+import functools
 import os
-import pandas as pd
+
+from CostPackage.Aircraft.aircraft_cluster import get_aircraft_cluster_dict
+from CostPackage.ReferenceData.reference_data import get_csv_columns
+
+AIRCRAFT_CLUSTERING_FILE = os.path.join(os.path.dirname(__file__), "AircraftClustering.csv")
+AIRCRAFT_WIDE_BODY_FILE = os.path.join(os.path.dirname(__file__), "AircraftWideBody_2019.csv")
 
 
 class AircraftTypeError(Exception):
@@ -16,16 +22,18 @@ class AircraftTypeError(Exception):
 # see
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
 def is_valid_aircraft(aircraft_type: str):
-    df_aircraft_type = pd.read_csv(os.path.join(os.path.dirname(__file__), "AircraftClustering.csv"))
-    aircraft_type_list = df_aircraft_type['AircraftType'].values.tolist()
-    if aircraft_type in aircraft_type_list:
+    if aircraft_type in get_aircraft_cluster_dict():
         return True
     else:
         raise AircraftTypeError(aircraft_type)
 
 
+# Aircraft types (ICAO codes) of 2019 csv of AircraftWideBody
+@functools.cache
+def get_wide_body_aircraft() -> frozenset:
+    return frozenset(get_csv_columns(AIRCRAFT_WIDE_BODY_FILE)['AircraftType'].tolist())
+
+
 # Returns True if aircraft type (ICAO code) is in 2019 csv of AircraftWideBody
 def is_wide_body(aircraft_type: str):
-    df_wide_body_aircraft = pd.read_csv(os.path.join(os.path.dirname(__file__), "AircraftWideBody_2019.csv"))
-    wide_body_aircraft = df_wide_body_aircraft['AircraftType'].values.tolist()
-    return is_valid_aircraft(aircraft_type) and aircraft_type in wide_body_aircraft
+    return is_valid_aircraft(aircraft_type) and aircraft_type in get_wide_body_aircraft()
@@ -1,5 +1,8 @@
+import functools
 import os
-import pandas as pd
+import numpy as np
+
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
 
 
 class AircraftClusterError(Exception):
@@ -11,13 +14,61 @@ class AircraftClusterError(Exception):
         return "Aircraft " + self.flight + " not found"
 
 
-aircraft_cluster = pd.read_csv(os.path.join(os.path.dirname(__file__), "AircraftClustering.csv"))
-aircraft_cluster_dict = dict(zip(aircraft_cluster.AircraftType, aircraft_cluster.AssignedAircraftType))
+AIRCRAFT_CLUSTERING_FILE = os.path.join(os.path.dirname(__file__), "AircraftClustering.csv")
+
+
+# Aircraft type (ICAO code) -> aircraft cluster
+@functools.cache
+def get_aircraft_cluster_dict() -> dict:
+    aircraft_cluster = get_csv_columns(AIRCRAFT_CLUSTERING_FILE)
+    return dict(zip(aircraft_cluster["AircraftType"].tolist(), aircraft_cluster["AssignedAircraftType"].tolist()))
 
 
 # NOTE: Aircraft types are identified by their ICAO codes
 def get_aircraft_cluster(aircraft_type: str):
-    if aircraft_type in list(aircraft_cluster_dict.keys()):
-        return aircraft_cluster_dict[aircraft_type]
+    aircraft_cluster = get_aircraft_cluster_dict().get(aircraft_type)
+    if aircraft_cluster is not None:
+        return aircraft_cluster
     else:
         raise AircraftClusterError(aircraft_type)
+
+
+# Integer codes of the aircraft clusters, used to index the precompiled cost tables
+@functools.cache
+def get_aircraft_clusters() -> list:
+    return sorted(set(get_aircraft_cluster_dict().values()))
+
+
+@functools.cache
+def get_aircraft_cluster_codes() -> dict:
+    return {cluster: code for code, cluster in enumerate(get_aircraft_clusters())}
+
+
+def get_aircraft_cluster_code(aircraft_cluster: str) -> int:
+    aircraft_cluster_codes = get_aircraft_cluster_codes()
+    if aircraft_cluster in aircraft_cluster_codes:
+        return aircraft_cluster_codes[aircraft_cluster]
+    else:
+        raise AircraftClusterError(aircraft_cluster)
+
+
+# Compile the columns of a reference table with one row per aircraft cluster into a dense array
+# indexed by [aircraft cluster code, column], NaN for clusters missing in the table.
+# As for the lookups on the table only the first row of each cluster is considered
+def get_cluster_table(columns: dict, cluster_column: str, value_columns: list) -> np.ndarray:
+    aircraft_cluster_codes = get_aircraft_cluster_codes()
+    table = np.full((len(aircraft_cluster_codes), len(value_columns)), np.nan)
+    for row in reversed(range(len(columns[cluster_column]))):
+        if columns[cluster_column][row] in aircraft_cluster_codes:
+            table[aircraft_cluster_codes[columns[cluster_column][row]]] = [columns[value_column][row] for
+                                                                           value_column in value_columns]
+    return table
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "aircraft_cluster":
+        return get_csv_dataframe(AIRCRAFT_CLUSTERING_FILE)
+    if name == "aircraft_cluster_dict":
+        return get_aircraft_cluster_dict()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
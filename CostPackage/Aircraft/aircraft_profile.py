@@ -0,0 +1,56 @@
+import functools
+import os
+import numpy as np
+
+from CostPackage.Aircraft.aircraft import get_wide_body_aircraft
+from CostPackage.Aircraft.aircraft_cluster import AIRCRAFT_CLUSTERING_FILE, AircraftClusterError, \
+    get_aircraft_cluster_codes, get_cluster_table
+from CostPackage.ReferenceData.reference_data import get_csv_columns
+from CostPackage.Scenario.scenario import SCENARIOS
+
+AIRCRAFT_SEATS_FILE = os.path.join(os.path.dirname(__file__), "AircraftSeats_2019.csv")
+
+# One record per aircraft type (ICAO code) of AircraftClustering.csv:
+# aircraft cluster and its code, MTOW in tonnes, seats of the cluster for each scenario (in SCENARIOS order)
+# and wide-body flag of the cluster
+AIRCRAFT_PROFILE_DTYPE = np.dtype([
+    ("aircraft_type", "U8"),
+    ("aircraft_cluster", "U8"),
+    ("aircraft_cluster_code", np.int16),
+    ("mtow", np.float64),
+    ("seats", np.float64, (len(SCENARIOS),)),
+    ("wide_body", np.bool_)
+])
+
+
+# Profiles of all the aircraft types, built once from the reference files
+@functools.cache
+def get_aircraft_profiles() -> np.ndarray:
+    aircraft_clustering = get_csv_columns(AIRCRAFT_CLUSTERING_FILE)
+    aircraft_cluster_codes = get_aircraft_cluster_codes()
+    seats_table = get_cluster_table(get_csv_columns(AIRCRAFT_SEATS_FILE), "AircraftType", SCENARIOS)
+    wide_body_aircraft = get_wide_body_aircraft()
+    profiles = np.zeros(aircraft_clustering["AircraftType"].size, dtype=AIRCRAFT_PROFILE_DTYPE)
+    profiles["aircraft_type"] = aircraft_clustering["AircraftType"]
+    profiles["aircraft_cluster"] = aircraft_clustering["AssignedAircraftType"]
+    profiles["aircraft_cluster_code"] = [aircraft_cluster_codes[aircraft_cluster] for aircraft_cluster
+                                         in aircraft_clustering["AssignedAircraftType"].tolist()]
+    profiles["mtow"] = aircraft_clustering["MTOW"]
+    profiles["seats"] = seats_table[profiles["aircraft_cluster_code"]]
+    profiles["wide_body"] = [aircraft_cluster in wide_body_aircraft for aircraft_cluster
+                             in aircraft_clustering["AssignedAircraftType"].tolist()]
+    profiles.flags.writeable = False
+    return profiles
+
+
+# Row of each aircraft type in get_aircraft_profiles
+@functools.cache
+def get_aircraft_profile_index() -> dict:
+    return {aircraft_type: row for row, aircraft_type in enumerate(get_aircraft_profiles()["aircraft_type"].tolist())}
+
+
+def get_aircraft_profile(aircraft_type: str) -> np.void:
+    row = get_aircraft_profile_index().get(aircraft_type)
+    if row is None:
+        raise AircraftClusterError(aircraft_type)
+    return get_aircraft_profiles()[row]
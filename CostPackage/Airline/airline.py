@@ -1,8 +1,11 @@
+import functools
 import os
-import pandas as pd
+from typing import NamedTuple
+
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
 
 # airline_static.csv from Mercury Dataset
-df_airlines = pd.read_csv(os.path.join(os.path.dirname(__file__), "airline_static.csv"))
+AIRLINES_FILE = os.path.join(os.path.dirname(__file__), "airline_static.csv")
 
 
 class AirlineCodeError(Exception):
@@ -14,20 +17,50 @@ class AirlineCodeError(Exception):
         return "Airline " + self.airline_icao + " not found"
 
 
-def is_valid_airline_icao(airline_icao: str):
-    if airline_icao in df_airlines['ICAO'].values:
-        return True
-    else:
-        raise AirlineCodeError
-
-
 # AO_type
 # REG - Regional
 # FSC - Full Service Carrier
 # LCC - Low-Cost Carrier
 # CHT - Charter
+class Airline(NamedTuple):
+    icao: str
+    ao_type: str
+    alliance: str
+    hubs: tuple[str, ...]
+
+
+# Airlines of airline_static.csv by ICAO code, built on first use. Hubs are listed as ICAO codes separated by _
+@functools.cache
+def get_airline_index() -> dict:
+    airlines = get_csv_columns(AIRLINES_FILE)
+    return {icao: Airline(icao, ao_type, alliance, tuple(hub for hub in hubs.split("_") if hub))
+            for icao, ao_type, alliance, hubs in zip(airlines['ICAO'].tolist(), airlines['AO_type'].tolist(),
+                                                     airlines['alliance'].tolist(), airlines['hubs'].tolist())}
+
+
+def get_airline(airline_icao: str) -> Airline:
+    airline = get_airline_index().get(airline_icao)
+    if airline is None:
+        raise AirlineCodeError(airline_icao)
+    return airline
+
+
+def is_valid_airline_icao(airline_icao: str):
+    if airline_icao in get_airline_index():
+        return True
+    else:
+        raise AirlineCodeError(airline_icao)
+
+
 def is_LCC_airline_icao(airline_icao: str):
-    if is_valid_airline_icao(airline_icao) and df_airlines[df_airlines.ICAO == airline_icao].iloc[0].AO_type == 'LCC':
+    if get_airline(airline_icao).ao_type == 'LCC':
         return True
     else:
         return False
+
+
+# The DataFrame of the previous versions is still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "df_airlines":
+        return get_csv_dataframe(AIRLINES_FILE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
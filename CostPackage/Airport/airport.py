@@ -1,5 +1,8 @@
-import pandas as pd
+import functools
 import os
+import numpy as np
+
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
 
 
 class AirportCodeError(Exception):
@@ -11,15 +14,36 @@ class AirportCodeError(Exception):
         return "Airport " + self.airport_icao + " not found"
 
 
-df_airports = pd.read_csv(os.path.join(os.path.dirname(__file__), "Airports.csv"))
-group_1_airports = pd.read_csv(os.path.join(os.path.dirname(__file__), "airportMore25M.csv"))
+AIRPORTS_FILE = os.path.join(os.path.dirname(__file__), "Airports.csv")
+GROUP_1_AIRPORTS_FILE = os.path.join(os.path.dirname(__file__), "airportMore25M.csv")
+
+# Mean Earth radius in km
+EARTH_RADIUS = 6371.
+
+
+# Row of each airport of Airports.csv by ICAO code, built on first use
+@functools.cache
+def get_airport_index() -> dict:
+    return {airport_icao: row for row, airport_icao in enumerate(get_csv_columns(AIRPORTS_FILE)['ICAO'].tolist())}
+
+
+@functools.cache
+def get_group_1_airports() -> frozenset:
+    return frozenset(get_csv_columns(GROUP_1_AIRPORTS_FILE)['Airport'].tolist())
+
+
+# Latitude and longitude in radians of the airports, indexed by the rows of get_airport_index
+@functools.cache
+def get_airport_coordinates() -> tuple[np.ndarray, np.ndarray]:
+    airports = get_csv_columns(AIRPORTS_FILE)
+    return np.radians(airports['Latitude']), np.radians(airports['Logtitude'])
 
 
 def is_valid_airport_icao(airport_icao: str):
-    if airport_icao in df_airports['ICAO'].values:
+    if airport_icao in get_airport_index():
         return True
     else:
-        raise AirportCodeError
+        raise AirportCodeError(airport_icao)
 
 
 # airport is in group 1 if it has more than 25 million passengers
@@ -29,7 +53,47 @@ def is_valid_airport_icao(airport_icao: str):
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
 def is_group_1_airport(airport_icao: str):
     if is_valid_airport_icao(airport_icao):
-        if airport_icao in group_1_airports.to_list():
+        if airport_icao in get_group_1_airports():
             return True
         else:
             return False
+
+
+# Rows of the airports in Airports.csv, AirportCodeError for the first airport not found
+def get_airport_rows(airports_icao) -> np.ndarray:
+    airport_index = get_airport_index()
+    try:
+        return np.fromiter((airport_index[airport_icao] for airport_icao in airports_icao), dtype=np.intp)
+    except KeyError as key_error:
+        raise AirportCodeError(str(key_error.args[0]))
+
+
+# Great circle distance in km between the airports of the given rows (haversine formula), vectorized
+def get_great_circle_distance(origin_rows: np.ndarray, destination_rows: np.ndarray) -> np.ndarray:
+    latitude, longitude = get_airport_coordinates()
+    haversine = (np.sin((latitude[destination_rows] - latitude[origin_rows]) / 2) ** 2
+                 + np.cos(latitude[origin_rows]) * np.cos(latitude[destination_rows])
+                 * np.sin((longitude[destination_rows] - longitude[origin_rows]) / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(haversine))
+
+
+# Flight length in km between two airports as great circle distance, frequent city pairs are cached
+@functools.lru_cache(maxsize=4096)
+def get_flight_length(origin_airport_icao: str, destination_airport_icao: str) -> float:
+    return float(get_great_circle_distance(*get_airport_rows((origin_airport_icao, destination_airport_icao))))
+
+
+# Flight lengths in km of many flights, the distance is computed once for each city pair
+def get_flight_lengths(origin_airports_icao, destination_airports_icao) -> np.ndarray:
+    rows = np.stack((get_airport_rows(origin_airports_icao), get_airport_rows(destination_airports_icao)))
+    city_pairs, flight_city_pair = np.unique(rows, axis=1, return_inverse=True)
+    return get_great_circle_distance(city_pairs[0], city_pairs[1])[flight_city_pair.reshape(-1)]
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "df_airports":
+        return get_csv_dataframe(AIRPORTS_FILE, skipinitialspace=True)
+    if name == "group_1_airports":
+        return get_csv_dataframe(GROUP_1_AIRPORTS_FILE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,36 @@
+import functools
 import os
 from typing import Callable
-import pandas as pd
-from CostPackage.Scenario.scenario import get_scenario
+import numpy as np
+
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
+from CostPackage.Aircraft.aircraft_cluster import get_aircraft_cluster_code, get_cluster_table
+from CostPackage.Scenario.scenario import get_scenario_code, SCENARIOS
+from CostPackage.piecewise_cost_function import get_linear_cost_function
 
 # Costs are expressed in EUR/min for three different scenarios low,base and high
 # low scenario costs are set to zero by default
 # see Table 8 at page 16/39 of following document
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
-df_crew = pd.read_csv(os.path.join(os.path.dirname(__file__), "CrewTacticalCosts_2019.csv"))
+CREW_COSTS_FILE = os.path.join(os.path.dirname(__file__), "CrewTacticalCosts_2019.csv")
+
+
+# Crew costs in EUR/min indexed by [aircraft cluster code, scenario code]
+@functools.cache
+def get_crew_costs_table() -> np.ndarray:
+    return get_cluster_table(get_csv_columns(CREW_COSTS_FILE), "Aircraft", SCENARIOS)
 
 
 def get_crew_costs(aircraft_cluster: str, scenario: str) -> Callable:
-    entry_scenario = get_scenario(scenario)
-    crew_cost = df_crew[(df_crew.Aircraft == aircraft_cluster)][entry_scenario].iloc[0]
-    return lambda delay: crew_cost * delay
+    crew_cost = get_crew_costs_table()[get_aircraft_cluster_code(aircraft_cluster), get_scenario_code(scenario)]
+    return get_linear_cost_function(crew_cost)
 
 
 # Crew costs in EUR/min provided directly by user without scenario
 def get_crew_costs_from_exact_value(crew_costs_exact_value: float) -> Callable:
     if crew_costs_exact_value < 0:
         raise InvalidCrewCostsValueError(crew_costs_exact_value)
-    return lambda delay: crew_costs_exact_value * delay
+    return get_linear_cost_function(crew_costs_exact_value)
 
 
 class InvalidCrewCostsValueError(Exception):
@@ -31,3 +41,10 @@ class InvalidCrewCostsValueError(Exception):
 
     def __repr__(self):
         return "Exact crew costs value " + format(self.crew_costs_exact_value, '.2f') + " invalid. Value should be >=0"
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "df_crew":
+        return get_csv_dataframe(CREW_COSTS_FILE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
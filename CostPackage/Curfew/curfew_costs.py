@@ -1,6 +1,11 @@
 from typing import Callable
+import functools
 import os
-import pandas as pd
+import numpy as np
+
+from CostPackage.Aircraft.aircraft_cluster import get_aircraft_cluster_code, get_cluster_table
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
+from CostPackage.piecewise_cost_function import get_constant_cost_function, get_step_cost_function
 
 
 # Crew costs in EUR provided directly by user without scenario
@@ -10,7 +15,16 @@ def get_curfew_costs_from_exact_value(curfew_costs_exact_value: float) -> float:
     return curfew_costs_exact_value
 
 
-df_curfew = pd.read_csv(os.path.join(os.path.dirname(__file__), "curfew.csv"))
+CURFEW_COSTS_FILE = os.path.join(os.path.dirname(__file__), "curfew.csv")
+
+# Curfew costs in EUR for each passenger affected by the curfew violation
+CURFEW_COSTS_PER_PASSENGER = 300
+
+
+# Fixed curfew costs in EUR indexed by aircraft cluster code
+@functools.cache
+def get_curfew_costs_table() -> np.ndarray:
+    return get_cluster_table(get_csv_columns(CURFEW_COSTS_FILE), "AirCluster", ["Cost"])[:, 0]
 
 
 # -------------------------------------------------------------------------------------------------
@@ -27,7 +41,16 @@ df_curfew = pd.read_csv(os.path.join(os.path.dirname(__file__), "curfew.csv"))
 # --------------------------------------------------------------------------------------------------
 
 def get_curfew_costs(aircraft_cluster: str, curfew_passengers: int, scenario: str = None) -> float:
-    return curfew_passengers * 300 + df_curfew[df_curfew.AirCluster == aircraft_cluster].Cost.iloc[0]
+    return (curfew_passengers * CURFEW_COSTS_PER_PASSENGER
+            + get_curfew_costs_table()[get_aircraft_cluster_code(aircraft_cluster)])
+
+
+# Curfew costs as a function of delay, the total curfew costs are charged from the curfew threshold on,
+# or for any delay if no threshold is provided (curfew already violated)
+def get_curfew_costs_function(curfew_costs: float, curfew_threshold: float = None) -> Callable:
+    if curfew_threshold is None:
+        return get_constant_cost_function(curfew_costs)
+    return get_step_cost_function([curfew_threshold], [curfew_costs])
 
 
 class InvalidCurfewCostsValueError(Exception):
@@ -39,3 +62,10 @@ class InvalidCurfewCostsValueError(Exception):
     def __repr__(self):
         return "Exact curfew costs value " + format(self.curfew_costs_exact_value,
                                                     '.2f') + " invalid. Value should be >=0"
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "df_curfew":
+        return get_csv_dataframe(CURFEW_COSTS_FILE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -18,5 +18,14 @@ def get_flight_phase(flight_phase: str):
         case "EN_ROUTE":
             return "EN_ROUTE"
         case _:
-            return FlightPhaseError(flight_phase)
+            raise FlightPhaseError(flight_phase)
+
+
+# Integer codes of the flight phases, used to index the precompiled cost tables
+FLIGHT_PHASES = ["AT_GATE", "TAXI", "EN_ROUTE"]
+flight_phase_codes = {flight_phase: code for code, flight_phase in enumerate(FLIGHT_PHASES)}
+
+
+def get_flight_phase_code(flight_phase: str) -> int:
+    return flight_phase_codes[get_flight_phase(flight_phase)]
 
@@ -1,9 +1,9 @@
 import os
 from typing import Callable
-import pandas as pd
 
 from CostPackage.FlightPhase.flight_phase import get_flight_phase, FlightPhaseError
 from CostPackage.Scenario.scenario import get_scenario, ScenarioError
+from CostPackage.piecewise_cost_function import get_linear_cost_function
 
 
 # df_fuel_at_gate = pd.read_csv(os.path.join(os.path.dirname(__file__), "FuelTacticalCosts_AT_GATE_2019.csv"))
@@ -39,7 +39,7 @@ from CostPackage.Scenario.scenario import get_scenario, ScenarioError
 def get_fuel_costs_from_exact_value(fuel_costs_exact_value: float) -> Callable:
     if fuel_costs_exact_value < 0:
         raise InvalidFuelCostsValueError(fuel_costs_exact_value)
-    return lambda delay: fuel_costs_exact_value * delay
+    return get_linear_cost_function(fuel_costs_exact_value)
 
 
 class InvalidFuelCostsValueError(Exception):
@@ -22,3 +22,8 @@ def get_haul(flight_length: float) -> str:
         return "LongHaul"
     else:
         raise HaulError(flight_length)
+
+
+# Integer codes of the hauls, used to index the precompiled cost tables
+HAULS = ["ShortHaul", "MediumHaul", "LongHaul"]
+haul_codes = {haul: code for code, haul in enumerate(HAULS)}
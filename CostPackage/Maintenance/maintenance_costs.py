@@ -1,44 +1,49 @@
+import functools
 import os
 from typing import Callable
-import pandas as pd
+import numpy as np
 
-from CostPackage.FlightPhase.flight_phase import get_flight_phase, FlightPhaseError
-from CostPackage.Scenario.scenario import get_scenario, ScenarioError
+from CostPackage.Aircraft.aircraft_cluster import get_aircraft_cluster_code, get_cluster_table
+from CostPackage.FlightPhase.flight_phase import get_flight_phase_code, FlightPhaseError
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
+from CostPackage.Scenario.scenario import get_scenario_code, ScenarioError, SCENARIOS
+from CostPackage.piecewise_cost_function import get_linear_cost_function
 
 # Costs are expressed in EUR/min for three different scenarios low,base and high
 # see Table 6 at page 14/39 of following document
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
-df_maintenance_at_gate = pd.read_csv(
-    os.path.join(os.path.dirname(__file__), "MaintenanceTacticalCosts_AT_GATE_2019.csv"))
+MAINTENANCE_COSTS_AT_GATE_FILE = os.path.join(os.path.dirname(__file__), "MaintenanceTacticalCosts_AT_GATE_2019.csv")
 
 # Costs are expressed in EUR/min for three different scenarios low,base and high
 # see Table 21 of Appendix C at page 38/39 of following document
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
-df_maintenance_taxi = pd.read_csv(os.path.join(os.path.dirname(__file__), "MaintenanceTacticalCosts_TAXI_2019.csv"))
+MAINTENANCE_COSTS_TAXI_FILE = os.path.join(os.path.dirname(__file__), "MaintenanceTacticalCosts_TAXI_2019.csv")
 
 # Costs are expressed in EUR/min for three different scenarios low,base and high
 # see Table 22 of Appendix C at page 39/39 of following document
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
-df_maintenance_en_route = pd.read_csv(
-    os.path.join(os.path.dirname(__file__), "MaintenanceTacticalCosts_EN_ROUTE_2019.csv"))
+MAINTENANCE_COSTS_EN_ROUTE_FILE = os.path.join(os.path.dirname(__file__),
+                                               "MaintenanceTacticalCosts_EN_ROUTE_2019.csv")
+
+# Maintenance costs files in the order of FLIGHT_PHASES
+maintenance_costs_files = {"df_maintenance_at_gate": MAINTENANCE_COSTS_AT_GATE_FILE,
+                           "df_maintenance_taxi": MAINTENANCE_COSTS_TAXI_FILE,
+                           "df_maintenance_en_route": MAINTENANCE_COSTS_EN_ROUTE_FILE}
+
+
+# Maintenance costs in EUR/min indexed by [aircraft cluster code, flight phase code, scenario code]
+@functools.cache
+def get_maintenance_costs_table() -> np.ndarray:
+    return np.stack([get_cluster_table(get_csv_columns(maintenance_costs_file), "Aircraft", SCENARIOS)
+                     for maintenance_costs_file in maintenance_costs_files.values()], axis=1)
 
 
 def get_maintenance_costs(aircraft_cluster: str, scenario: str, flight_phase: str) -> Callable:
     try:
-        entry_scenario = get_scenario(scenario)
-        entry_flight_phase = get_flight_phase(flight_phase)
-        if entry_flight_phase == "AT_GATE":
-            maintenance_cost = \
-                df_maintenance_at_gate[(df_maintenance_at_gate.Aircraft == aircraft_cluster)][entry_scenario].iloc[0]
-        elif entry_flight_phase == "TAXI":
-            maintenance_cost = \
-                df_maintenance_taxi[(df_maintenance_taxi.Aircraft == aircraft_cluster)][entry_scenario].iloc[
-                    0]
-        else:  # EN_ROUTE
-            maintenance_cost = \
-                df_maintenance_en_route[(df_maintenance_en_route.Aircraft == aircraft_cluster)][entry_scenario].iloc[0]
-
-        return lambda delay: maintenance_cost * delay
+        maintenance_cost = get_maintenance_costs_table()[get_aircraft_cluster_code(aircraft_cluster),
+                                                         get_flight_phase_code(flight_phase),
+                                                         get_scenario_code(scenario)]
+        return get_linear_cost_function(maintenance_cost)
 
     except ScenarioError as scenario_error:
         print(scenario_error.message)
@@ -50,7 +55,7 @@ def get_maintenance_costs(aircraft_cluster: str, scenario: str, flight_phase: st
 def get_maintenance_costs_from_exact_value(maintenance_costs_exact_value: float) -> Callable:
     if maintenance_costs_exact_value < 0:
         raise InvalidMaintenanceCostsValueError(maintenance_costs_exact_value)
-    return lambda delay: maintenance_costs_exact_value * delay
+    return get_linear_cost_function(maintenance_costs_exact_value)
 
 
 class InvalidMaintenanceCostsValueError(Exception):
@@ -62,3 +67,10 @@ class InvalidMaintenanceCostsValueError(Exception):
     def __repr__(self):
         return ("Exact maintenance costs value " + format(self.maintenance_costs_exact_value, '.2f')
                 + " invalid. Value should be >=0")
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name in maintenance_costs_files:
+        return get_csv_dataframe(maintenance_costs_files[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
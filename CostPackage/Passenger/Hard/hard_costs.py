@@ -1,17 +1,23 @@
+import functools
 import os
-import pandas as pd
 import numpy as np
 from typing import Callable
 
+from CostPackage.Haul.haul import HAULS, haul_codes
+from CostPackage.piecewise_cost_function import get_step_cost_function
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
 from CostPackage.Scenario.scenario import get_scenario
 
 # Costs are expressed in EUR
 # see Tables 13 and 14 at page 21/39 of following document
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
-df_hard_reimbursement_rate = pd.read_csv(
-    os.path.join(os.path.dirname(__file__), "PassengerReimbursementRates_2019.csv"))
-df_hard_waiting_rate = pd.read_csv(os.path.join(os.path.dirname(__file__), "PassengerWaitingRates_2019.csv"))
-df_hard = pd.read_csv(os.path.join(os.path.dirname(__file__), "PassengerTacticalCosts_HARD_2019.csv"))
+HARD_REIMBURSEMENT_RATE_FILE = os.path.join(os.path.dirname(__file__), "PassengerReimbursementRates_2019.csv")
+HARD_WAITING_RATE_FILE = os.path.join(os.path.dirname(__file__), "PassengerWaitingRates_2019.csv")
+HARD_COSTS_FILE = os.path.join(os.path.dirname(__file__), "PassengerTacticalCosts_HARD_2019.csv")
+
+hard_costs_files = {"df_hard_reimbursement_rate": HARD_REIMBURSEMENT_RATE_FILE,
+                    "df_hard_waiting_rate": HARD_WAITING_RATE_FILE,
+                    "df_hard": HARD_COSTS_FILE}
 
 # from The cost of passenger delay to airlines in Europe, consultation document, UOW 2015
 # confirmed in deliverable D3.2 Industry  briefing  on updates  to  the  European cost of delay, Beacon Project, 2019
@@ -22,44 +28,65 @@ REIMBURSEMENT_RATE = 0.2
 WAITING_RATE_LOW_COST = .9
 REIMBURSEMENT_RATE_LOW_COST = 0.1
 
+# Delay thresholds in minutes at which the hard costs change
+DELAY_THRESHOLDS = np.array([120, 180, 240, 300, 600])
+
+
+# Values of a hard costs table for the given cost type, one for each delay threshold
+def get_cost_type_values(hard_costs_file: str, cost_type: str, haul: str) -> np.ndarray:
+    columns = get_csv_columns(hard_costs_file)
+    return columns[haul][columns["CostType"] == cost_type]
+
 
 def get_cost(cost_type: str, haul: str):
-    return df_hard[df_hard.CostType == cost_type][haul]
+    return get_cost_type_values(HARD_COSTS_FILE, cost_type, haul)
 
 
 def get_waiting_rate(cost_type: str, haul: str):
-    return df_hard_waiting_rate[df_hard_waiting_rate.CostType == cost_type][haul]
+    return get_cost_type_values(HARD_WAITING_RATE_FILE, cost_type, haul)
 
 
 def get_reimbursement_rate(cost_type: str, haul: str):
-    return df_hard_reimbursement_rate[df_hard_reimbursement_rate.CostType == cost_type][haul]
+    return get_cost_type_values(HARD_REIMBURSEMENT_RATE_FILE, cost_type, haul)
 
 
-def get_interval(delay, costs, delays):
-    if delay < delays[0]:
-        return 0
-    else:
-        for i in range(delays.shape[0] - 1):
-            if delays[i] <= delay < delays[i + 1]:
-                return costs[i]
-        return costs[-1]
-
-
-def get_hard_costs(passengers: int, scenario: str, haul: str) -> Callable:
-    waiting_passengers = passengers * (WAITING_RATE_LOW_COST if get_scenario(scenario) == "LowScenario"
-                                       else WAITING_RATE)
-    reimbursement_passengers = passengers * (REIMBURSEMENT_RATE_LOW_COST if get_scenario(scenario) == "LowScenario"
-                                             else REIMBURSEMENT_RATE)
+# Hard costs in EUR of a single passenger at each one of the DELAY_THRESHOLDS
+# computed from the reference tables for airlines applying low-cost or standard waiting and reimbursement rates
+def compute_hard_costs_per_passenger(haul: str, is_low_cost: bool) -> np.ndarray:
+    waiting_rate = WAITING_RATE_LOW_COST if is_low_cost else WAITING_RATE
+    reimbursement_rate = REIMBURSEMENT_RATE_LOW_COST if is_low_cost else REIMBURSEMENT_RATE
     passenger_care_support_list = ["care", "reimbursement_rebooking", "compensation", "accommodation"]
     waiting_passenger_costs = 0
     reimbursement_passenger_costs = 0
     for passenger_care_support_type in passenger_care_support_list:
         waiting_passenger_costs += (get_cost(passenger_care_support_type, haul)
-                                    * get_waiting_rate(passenger_care_support_type, haul)).to_numpy()
+                                    * get_waiting_rate(passenger_care_support_type, haul))
         reimbursement_passenger_costs += (get_cost(passenger_care_support_type, haul)
-                                          * get_reimbursement_rate(passenger_care_support_type, haul)).to_numpy()
+                                          * get_reimbursement_rate(passenger_care_support_type, haul))
+
+    return waiting_rate * waiting_passenger_costs + reimbursement_rate * reimbursement_passenger_costs
+
+
+# Hard costs in EUR of a single passenger indexed by [haul code, low-cost rates (0 or 1), delay threshold]
+@functools.cache
+def get_hard_costs_table() -> np.ndarray:
+    return np.array([[compute_hard_costs_per_passenger(haul, is_low_cost) for is_low_cost in [False, True]]
+                     for haul in HAULS])
+
+
+# Hard costs in EUR of a single passenger at each one of the DELAY_THRESHOLDS
+# low-cost waiting and reimbursement rates are applied in the low scenario
+def get_hard_costs_per_passenger(scenario: str, haul: str) -> np.ndarray:
+    return get_hard_costs_table()[haul_codes[haul], int(get_scenario(scenario) == "LowScenario")]
+
+
+def get_hard_costs(passengers: int, scenario: str, haul: str) -> Callable:
+    total_passenger_costs = passengers * get_hard_costs_per_passenger(scenario=scenario, haul=haul)
+    return get_step_cost_function(DELAY_THRESHOLDS, total_passenger_costs)
+
 
-    total_passenger_costs = (waiting_passengers * waiting_passenger_costs + reimbursement_passengers
-                             * reimbursement_passenger_costs)
-    delays = np.array([120, 180, 240, 300, 600])
-    return lambda delay: get_interval(delay, total_passenger_costs, delays)
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name in hard_costs_files:
+        return get_csv_dataframe(hard_costs_files[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,10 @@
+import functools
 import os
 from typing import Callable
-import pandas as pd
-from CostPackage.Scenario.scenario import get_scenario
+import numpy as np
+from CostPackage.ReferenceData.reference_data import get_csv_columns, get_csv_dataframe
+from CostPackage.Scenario.scenario import get_scenario_code, SCENARIOS
+from CostPackage.piecewise_cost_function import get_interpolated_rate_cost_function
 
 # ATTENTION: as mentioned in the following document
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
@@ -14,26 +17,35 @@ from CostPackage.Scenario.scenario import get_scenario
 # https://www.eurocontrol.int/sites/default/files/publication/files/european-airline-delay-cost-reference-values-final-report-4-1.pdf
 # and adjusted to 2019 with compound inflation rate of 5.5% as mentioned in page 23/39 of
 # https://www.beacon-sesar.eu/wp-content/uploads/2022/10/893100-BEACON-D3.2-Industry-briefing-on-updates-to-the-European-cost-of-delay-V.01.01.00-1.pdf
-df_soft = pd.read_csv(os.path.join(os.path.dirname(__file__), "PassengerTacticalCosts_SOFT_2019.csv"))
+SOFT_COSTS_FILE = os.path.join(os.path.dirname(__file__), "PassengerTacticalCosts_SOFT_2019.csv")
 
+# To calculate the overall soft costs only a 10% of provided soft costs are used
+# this is why the discount factor is used see page 39/110 of following document
+# https://www.eurocontrol.int/sites/default/files/publication/files/european-airline-delay-cost-reference-values-final-report-4-1.pdf
+# see also page 64/110 of Annex D of the same document mentioned above where the use
+# of only 10% of total soft costs is mentioned
+DISCOUNT_FACTOR = 0.1
+
+
+# Soft costs indexed by [scenario code, delay] at the delays of get_soft_costs_delays
+@functools.cache
+def get_soft_costs_table() -> np.ndarray:
+    return np.array([get_csv_columns(SOFT_COSTS_FILE)[scenario] for scenario in SCENARIOS])
 
-def get_interpolated_value(delay, costs, delays):
-    if delay < delays[0]:
-        return delay * (costs[0]) / (delays[0])
-    for i in range(delays.shape[0] - 1):
-        if delays[i] <= delay < delays[i + 1]:
-            return (delay - delays[i]) * (costs[i + 1] - costs[i]) / (delays[i + 1] - delays[i]) + costs[i]
-    return costs[-1]
+
+@functools.cache
+def get_soft_costs_delays() -> np.ndarray:
+    return get_csv_columns(SOFT_COSTS_FILE)["Delay"]
 
 
 def get_soft_costs(passengers: int, scenario: str) -> Callable:
-    entry_scenario = get_scenario(scenario)
-    costs = df_soft[entry_scenario].to_numpy()
-    delays = df_soft.Delay.to_numpy()
-    # To calculate the overall soft costs only a 10% of provided soft costs are used
-    # this is why the discount_factor is used see page 39/110 of following document
-    # https://www.eurocontrol.int/sites/default/files/publication/files/european-airline-delay-cost-reference-values-final-report-4-1.pdf
-    # see also page 64/110 of Annex D of the same document mentioned above where the use
-    # of only 10% of total soft costs is mentioned
-    discount_factor = 0.1
-    return lambda delay: get_interpolated_value(delay, costs, delays) * passengers * delay * discount_factor
+    costs = get_soft_costs_table()[get_scenario_code(scenario)]
+    delays = get_soft_costs_delays()
+    return get_interpolated_rate_cost_function(delays, costs, factor=passengers * DISCOUNT_FACTOR)
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "df_soft":
+        return get_csv_dataframe(SOFT_COSTS_FILE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
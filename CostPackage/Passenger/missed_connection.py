@@ -0,0 +1,38 @@
+import functools
+from typing import List, Tuple
+import numpy as np
+
+from CostPackage.Passenger.Hard.hard_costs import get_hard_costs
+from CostPackage.Passenger.Soft.soft_costs import get_soft_costs
+from CostPackage.piecewise_cost_function import PiecewiseCostFunction
+
+
+# Hard and soft costs for a single passenger, cost functions are immutable and shared
+@functools.cache
+def get_passenger_costs(scenario: str, haul: str) -> PiecewiseCostFunction:
+    return get_hard_costs(passengers=1, scenario=scenario, haul=haul) + get_soft_costs(passengers=1, scenario=scenario)
+
+
+# Hard and soft costs of passengers who may miss their connection
+# each passenger is a tuple (delay threshold, delay perceived):
+# below the threshold the passenger is charged the costs of the actual delay,
+# from the threshold on the passenger is charged the costs of the delay perceived at the final destination.
+# The passengers are sorted by threshold: at any delay the ones with threshold above it are charged the costs of
+# the delay, the others the prefix sum of their perceived delay costs, compiled into one piecewise function
+def get_missed_connection_costs(missed_connection_passengers: List[Tuple], scenario: str,
+                                haul: str) -> PiecewiseCostFunction:
+    passenger_costs = get_passenger_costs(scenario=scenario, haul=haul)
+    thresholds, perceived_delays = np.array([tuple(passenger) for passenger in missed_connection_passengers],
+                                           dtype=float).reshape(-1, 2).T
+    order = np.argsort(thresholds, kind="stable")
+    thresholds = thresholds[order]
+    perceived_costs = np.concatenate(([0.], np.cumsum(passenger_costs(perceived_delays[order]))))
+
+    breakpoints = np.union1d(passenger_costs.breakpoints, thresholds)
+    starts = np.concatenate(([-np.inf], breakpoints))
+    # number of passengers who missed the connection in each segment
+    missed = np.searchsorted(thresholds, starts, side="right")
+    coefficients = ((thresholds.size - missed)[:, np.newaxis]
+                    * passenger_costs.coefficients[np.searchsorted(passenger_costs.breakpoints, starts, side="right")])
+    coefficients[:, 0] += perceived_costs[missed]
+    return PiecewiseCostFunction(breakpoints, coefficients)
@@ -1,23 +1,22 @@
 import os
-import pandas as pd
 
-from CostPackage.Aircraft.aircraft import is_wide_body
-from CostPackage.Aircraft.aircraft_cluster import get_aircraft_cluster
-from CostPackage.Scenario.scenario import get_scenario
+from CostPackage.Aircraft.aircraft_profile import get_aircraft_profile
+from CostPackage.ReferenceData.reference_data import get_csv_dataframe
+from CostPackage.Scenario.scenario import get_scenario, scenario_codes
 
-df_seats = pd.read_csv(os.path.join(os.path.dirname(__file__), "../Aircraft/AircraftSeats_2019.csv"))
+SEATS_FILE = os.path.join(os.path.dirname(__file__), "../Aircraft/AircraftSeats_2019.csv")
 
 
 def get_passengers(aircraft_type: str, scenario: str = None, load_factor: float = None) -> int:
     entry_scenario = get_scenario(scenario)
-    aircraft_cluster = get_aircraft_cluster(aircraft_type)
-    seats = df_seats[(df_seats.Aircraft == aircraft_cluster)][entry_scenario].iloc[0]
+    aircraft_profile = get_aircraft_profile(aircraft_type)
+    seats = aircraft_profile["seats"][scenario_codes[entry_scenario]]
     if load_factor is not None:
         if 0 <= load_factor <= 1:
             return round(seats * load_factor)
         else:
             raise PassengersLoadFactorError(load_factor)
-    elif is_wide_body(aircraft_cluster):
+    elif aircraft_profile["wide_body"]:
         return round(seats * .85)
     elif entry_scenario == "LowScenario":
         return round(seats * .65)
@@ -34,3 +33,10 @@ class PassengersLoadFactorError(Exception):
 
     def __repr__(self):
         return "Passengers load factor " + str(self.load_factor) + " invalid. USE (0<=value<=1)"
+
+
+# The DataFrames of the previous versions are still available, loaded with pandas on first access
+def __getattr__(name: str):
+    if name == "df_seats":
+        return get_csv_dataframe(SEATS_FILE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
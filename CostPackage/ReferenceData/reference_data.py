@@ -0,0 +1,158 @@
+import csv
+import functools
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zipfile
+import numpy as np
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Binary artifact with all the bundled csv files compiled into numpy arrays, one per package installation
+# (named after the package directory). DELAY_COST_REFERENCE_CACHE can point to another location,
+# set it empty to always read the csv files
+REFERENCE_CACHE_FILE = os.environ.get("DELAY_COST_REFERENCE_CACHE", os.path.join(
+    os.path.expanduser("~"), ".cache", "DelayCostFunction",
+    "reference_data-" + hashlib.sha1(PACKAGE_DIRECTORY.encode("utf-8")).hexdigest()[:12] + ".npz"))
+
+# Key of the artifact member listing the compiled csv files
+MANIFEST_KEY = "manifest"
+
+
+# Read one of the bundled csv files without pandas
+# returns the columns by name: numeric columns as float arrays (NaN for empty values), the others as str arrays
+def read_csv_columns(path: str) -> dict:
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = [row for row in csv.reader(file, skipinitialspace=True) if row]
+    header, rows = rows[0], rows[1:]
+    columns = {}
+    for index, column in enumerate(header):
+        values = [row[index].strip() if index < len(row) else '' for row in rows]
+        try:
+            columns[column.strip()] = np.array([float(value) if value else np.nan for value in values])
+        except ValueError:
+            columns[column.strip()] = np.array(values, dtype=str)
+    return columns
+
+
+# Path of a csv file relative to the package directory, used as key in the binary artifact
+def get_reference_key(path: str) -> str:
+    return os.path.relpath(os.path.realpath(path), PACKAGE_DIRECTORY).replace(os.sep, "/")
+
+
+# All the csv files bundled with the package (the empty fuel costs tables are skipped)
+def get_reference_files() -> list:
+    return sorted(get_reference_key(path) for path in glob.glob(os.path.join(PACKAGE_DIRECTORY, "**", "*.csv"),
+                                                                 recursive=True) if os.path.getsize(path) > 0)
+
+
+# Package directory and size and modification time of each csv file, stored in the artifact when it is built:
+# the artifact is used only for the same files, whatever the order of the modification times
+def get_reference_manifest(reference_files: list) -> dict:
+    stamps = []
+    for reference_file in reference_files:
+        stat = os.stat(os.path.join(PACKAGE_DIRECTORY, reference_file))
+        stamps.append([stat.st_size, stat.st_mtime_ns])
+    return {"package_directory": PACKAGE_DIRECTORY, "files": reference_files, "stamps": stamps}
+
+
+# Build step: compile all the bundled csv files into one uncompressed npz file.
+# The file is written next to the destination and then moved in place,
+# processes reading the previous artifact are not affected
+def build_reference_cache(cache_file: str = REFERENCE_CACHE_FILE) -> str:
+    reference_files = get_reference_files()
+    arrays = {MANIFEST_KEY: np.array(json.dumps(get_reference_manifest(reference_files)))}
+    for reference_file in reference_files:
+        for column, values in read_csv_columns(os.path.join(PACKAGE_DIRECTORY, reference_file)).items():
+            arrays[reference_file + "::" + column] = values
+
+    os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(cache_file)), suffix=".npz",
+                                     delete=False) as file:
+        np.savez(file, **arrays)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, cache_file)
+    return cache_file
+
+
+# The artifact is stale if it is missing, if it was built by another package installation,
+# or if the csv files differ (added, removed, different size or modification time) from the compiled ones
+def is_reference_cache_stale(cache_file: str = REFERENCE_CACHE_FILE) -> bool:
+    if not os.path.isfile(cache_file):
+        return True
+    try:
+        with np.load(cache_file) as artifact:
+            manifest = json.loads(str(artifact[MANIFEST_KEY]))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return True
+    try:
+        return manifest != get_reference_manifest(get_reference_files())
+    except OSError:
+        return True
+
+
+# Map the artifact read-only in memory, the arrays are views on one shared mapping of the file:
+# processes on the same host share the same pages instead of each parsing the csv files.
+# Returns the columns by name of each csv file (key relative to the package directory)
+def map_reference_cache(cache_file: str = REFERENCE_CACHE_FILE) -> dict:
+    tables = {}
+    with open(cache_file, "rb") as file, zipfile.ZipFile(file) as archive:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        for info in archive.infolist():
+            key = info.filename[:-len(".npy")]
+            if key == MANIFEST_KEY:
+                continue
+            # members are stored uncompressed, the npy header follows the zip local file header
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            shape, fortran_order, dtype = (np.lib.format.read_array_header_1_0(file) if version == (1, 0)
+                                           else np.lib.format.read_array_header_2_0(file))
+            values = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=file.tell())
+            reference_file, column = key.split("::", 1)
+            tables.setdefault(reference_file, {})[column] = values.reshape(shape,
+                                                                           order="F" if fortran_order else "C")
+    return tables
+
+
+# Runtime loader of the binary artifact, rebuilt when stale.
+# None if the artifact is disabled or cannot be written/read, csv files are read instead
+@functools.cache
+def get_reference_cache():
+    if not REFERENCE_CACHE_FILE:
+        return None
+    try:
+        if is_reference_cache_stale(REFERENCE_CACHE_FILE):
+            build_reference_cache(REFERENCE_CACHE_FILE)
+        return map_reference_cache(REFERENCE_CACHE_FILE)
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+# Reference tables are read lazily on first use and then cached,
+# importing the package does not read any csv file
+@functools.cache
+def get_csv_columns(path: str) -> dict:
+    reference_cache = get_reference_cache()
+    if reference_cache is not None and get_reference_key(path) in reference_cache:
+        return reference_cache[get_reference_key(path)]
+    return read_csv_columns(path)
+
+
+# pandas DataFrame of a reference table, pandas is imported only when a DataFrame is requested
+@functools.cache
+def get_csv_dataframe(path: str, skipinitialspace: bool = False):
+    import pandas as pd
+    return pd.read_csv(path, skipinitialspace=skipinitialspace)
+
+
+# Build step, e.g. at deployment time before starting a pool of processes:
+# python -m CostPackage.ReferenceData.reference_data [cache_file]
+if __name__ == "__main__":
+    import sys
+    print(build_reference_cache(*sys.argv[1:2]))
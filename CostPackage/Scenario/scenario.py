@@ -12,17 +12,26 @@ class ScenarioError(Exception):
 
 def get_scenario(scenario: str):
     match scenario.lower():
-        case 'low':
+        case 'low' | 'lowscenario':
             entry_scenario = 'LowScenario'
-        case 'base':
+        case 'base' | 'basescenario':
             entry_scenario = 'BaseScenario'
-        case 'high':
+        case 'high' | 'highscenario':
             entry_scenario = 'HighScenario'
         case _:
             raise ScenarioError(scenario)
     return entry_scenario
 
 
+# Integer codes of the cost scenarios, used to index the precompiled cost tables
+SCENARIOS = ["LowScenario", "BaseScenario", "HighScenario"]
+scenario_codes = {entry_scenario: code for code, entry_scenario in enumerate(SCENARIOS)}
+
+
+def get_scenario_code(scenario: str) -> int:
+    return scenario_codes[get_scenario(scenario)]
+
+
 # Cost scenario based on Aircraft Operator Low-Cost Carrier (LCC)
 # and destination airport in group 1 (large airports with more than 25 million passengers)
 # see page 28/39 of the following report (costs  originally  calculated by RDC aviation)
@@ -0,0 +1,302 @@
+import numpy as np
+import pandas as pd
+
+from CostPackage.Aircraft.aircraft_cluster import AircraftClusterError
+from CostPackage.Aircraft.aircraft_profile import get_aircraft_profiles, get_aircraft_profile_index
+from CostPackage.Airline.airline import get_airline_index, AirlineCodeError
+from CostPackage.Airport.airport import get_airport_index, get_group_1_airports, get_flight_lengths, \
+    AirportCodeError
+from CostPackage.Crew.crew_costs import get_crew_costs_table, InvalidCrewCostsValueError
+from CostPackage.Curfew.curfew_costs import get_curfew_costs_table, CURFEW_COSTS_PER_PASSENGER, \
+    InvalidCurfewCostsValueError
+from CostPackage.FlightPhase.flight_phase import flight_phase_codes, FlightPhaseError
+from CostPackage.Fuel.fuel_costs import InvalidFuelCostsValueError
+from CostPackage.Haul.haul import HAULS, haul_codes, HaulError
+from CostPackage.Maintenance.maintenance_costs import get_maintenance_costs_table, InvalidMaintenanceCostsValueError
+from CostPackage.Passenger.Hard.hard_costs import get_hard_costs_table, DELAY_THRESHOLDS
+from CostPackage.Passenger.Soft.soft_costs import get_soft_costs
+from CostPackage.Passenger.missed_connection import get_missed_connection_costs
+from CostPackage.Scenario.scenario import get_scenario, scenario_codes, SCENARIOS
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import FunctionInputParametersError
+
+# Names of the hard costs columns of the batch coefficients, one for each delay threshold
+HARD_COSTS_COLUMNS = ["hard_costs_" + str(delay_threshold) for delay_threshold in DELAY_THRESHOLDS]
+
+
+# Column of the flights table with missing values (None/NaN) replaced by default,
+# a column of defaults if the column is not provided at all
+def get_column(flights: pd.DataFrame, column: str, default=None) -> pd.Series:
+    if column not in flights.columns:
+        return pd.Series(default, index=flights.index, dtype=object)
+    values = flights[column].astype(object)
+    return values.where(values.notna(), default)
+
+
+# Tuples of the input columns (missed connection passengers, curfew) may come as lists or arrays
+# from pandas and Arrow tables
+def is_sequence(value) -> bool:
+    return isinstance(value, (tuple, list, np.ndarray))
+
+
+# Split a column holding either exact values (numbers) or scenarios (strings)
+# returns exact values (NaN where not provided) and scenario codes (default_scenario_code where not provided)
+def split_exact_value_and_scenario(values: pd.Series,
+                                   default_scenario_code: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    is_scenario = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    exact_value = pd.to_numeric(values.mask(is_scenario), errors='coerce').to_numpy(dtype=float)
+    codes = {scenario: scenario_codes[get_scenario(scenario)] for scenario in values[is_scenario].unique()}
+    scenario_code = np.array(default_scenario_code, dtype=int)
+    scenario_code[is_scenario] = values[is_scenario].map(codes).to_numpy(dtype=int)
+    return exact_value, scenario_code
+
+
+def get_batch_cost_coefficients(flights) -> pd.DataFrame:
+    """Resolve the cost coefficients of a whole table of flights column-wise
+    Parameters:
+        flights: pd.DataFrame | pyarrow.Table
+            one row per flight, columns are named as the parameters of get_tactical_delay_costs.
+            aircraft_type and flight_phase_input are required, all other columns are optional,
+            missing values (None/NaN) are managed as parameters not provided
+
+        return: pd.DataFrame
+            one row per flight with the derived parameters (aircraft_cluster, flight_phase, haul_type,
+            final_cost_scenario, final_passenger_scenario, adjusted_passengers_number),
+            crew, maintenance and fuel costs in EUR/min, total hard costs in EUR from each delay threshold on
+            (hard_costs_120 ... hard_costs_600), curfew costs in EUR charged from curfew_threshold on
+            (NaN threshold means charged at any delay) and the missed connection passengers
+        """
+    flights = flights if isinstance(flights, pd.DataFrame) else flights.to_pandas()
+
+    # Aircraft profiles (cluster, seats, wide-body) of the aircraft types
+    aircraft_type = get_column(flights, "aircraft_type")
+    aircraft_profile_row = aircraft_type.map(get_aircraft_profile_index())
+    if aircraft_profile_row.isna().any():
+        raise AircraftClusterError(str(aircraft_type[aircraft_profile_row.isna()].iloc[0]))
+    aircraft_profiles = get_aircraft_profiles()[aircraft_profile_row.to_numpy(dtype=np.intp)]
+    aircraft_cluster_code = aircraft_profiles["aircraft_cluster_code"].astype(int)
+    aircraft_cluster = aircraft_profiles["aircraft_cluster"].astype(object)
+
+    flight_phase = get_column(flights, "flight_phase_input", "").astype(str).str.strip().str.upper()
+    if (~flight_phase.isin(flight_phase_codes.keys())).any():
+        raise FlightPhaseError(flight_phase[~flight_phase.isin(flight_phase_codes.keys())].iloc[0])
+    flight_phase_code = flight_phase.map(flight_phase_codes).to_numpy(dtype=int)
+    flight_phase = flight_phase.to_numpy(dtype=object)
+
+    airports = {}
+    for airport_column in ["origin_airport", "destination_airport"]:
+        airports[airport_column] = get_column(flights, airport_column).astype("string").str.strip().str.upper()
+        airports_not_found = airports[airport_column].notna() & ~airports[airport_column].isin(
+            get_airport_index().keys())
+        if airports_not_found.any():
+            raise AirportCodeError(airports[airport_column][airports_not_found].iloc[0])
+
+    # Haul according to flight length, great circle distance between the airports if not provided,
+    # MediumHaul if neither is available
+    flight_length = pd.to_numeric(get_column(flights, "flight_length"),
+                                  errors='coerce').to_numpy(dtype=float, copy=True)
+    if (flight_length <= 0).any():
+        raise HaulError(flight_length[flight_length <= 0][0])
+    has_city_pair = (np.isnan(flight_length) & airports["origin_airport"].notna().to_numpy()
+                     & airports["destination_airport"].notna().to_numpy())
+    if has_city_pair.any():
+        great_circle_distance = get_flight_lengths(airports["origin_airport"][has_city_pair],
+                                                   airports["destination_airport"][has_city_pair])
+        flight_length[has_city_pair] = np.where(great_circle_distance > 0, great_circle_distance, np.nan)
+    haul_code = np.select([np.isnan(flight_length), flight_length <= 1500, flight_length <= 3500],
+                          [haul_codes["MediumHaul"], haul_codes["ShortHaul"], haul_codes["MediumHaul"]],
+                          haul_codes["LongHaul"])
+
+    # Airlines resolved through the airline index, is_low_cost_airline if provided takes precedence
+    is_low_cost_airline = get_column(flights, "is_low_cost_airline")
+    airline = get_column(flights, "airline").astype("string").str.strip().str.upper()
+    if airline.notna().any():
+        airline_index = get_airline_index()
+        airlines_not_found = airline.notna() & ~airline.isin(airline_index.keys())
+        if airlines_not_found.any():
+            raise AirlineCodeError(airline[airlines_not_found].iloc[0])
+        is_low_cost_airline = is_low_cost_airline.where(is_low_cost_airline.notna(), airline.map(
+            lambda icao: airline_index[icao].ao_type == "LCC", na_action="ignore").astype(object))
+    is_low_cost_airline = is_low_cost_airline.where(is_low_cost_airline.notna(), False).astype(bool).to_numpy()
+
+    # Cost scenario, low for LCC, high for destination airport in group 1, base otherwise
+    is_group_1_destination = airports["destination_airport"].isin(get_group_1_airports()).to_numpy()
+    scenario_code = np.where(is_low_cost_airline, scenario_codes["LowScenario"],
+                             np.where(is_group_1_destination, scenario_codes["HighScenario"],
+                                      scenario_codes["BaseScenario"]))
+
+    # PASSENGERS
+    missed_connection_passengers = get_column(flights, "missed_connection_passengers")
+    number_missed_connection_passengers = missed_connection_passengers.map(
+        lambda passengers: len(passengers) if is_sequence(passengers) else 0).to_numpy(dtype=int)
+    passengers_exact_value, passenger_scenario_code = split_exact_value_and_scenario(
+        get_column(flights, "passengers"), scenario_code)
+    seats = aircraft_profiles["seats"][np.arange(len(flights)), passenger_scenario_code]
+    load_factor = np.where(aircraft_profiles["wide_body"], .85,
+                           np.array([.65, .80, .95])[passenger_scenario_code])
+    passengers_number = np.where(np.isnan(passengers_exact_value), np.round(seats * load_factor),
+                                 passengers_exact_value - number_missed_connection_passengers)
+
+    # CREW COSTS
+    crew_exact_value, crew_scenario_code = split_exact_value_and_scenario(get_column(flights, "crew_costs"),
+                                                                          scenario_code)
+    if (crew_exact_value < 0).any():
+        raise InvalidCrewCostsValueError(crew_exact_value[crew_exact_value < 0][0])
+    crew_costs = np.where(np.isnan(crew_exact_value),
+                          get_crew_costs_table()[aircraft_cluster_code, crew_scenario_code], crew_exact_value)
+
+    # MAINTENANCE COSTS
+    maintenance_exact_value, maintenance_scenario_code = split_exact_value_and_scenario(
+        get_column(flights, "maintenance_costs"), scenario_code)
+    if (maintenance_exact_value < 0).any():
+        raise InvalidMaintenanceCostsValueError(maintenance_exact_value[maintenance_exact_value < 0][0])
+    maintenance_costs = np.where(np.isnan(maintenance_exact_value), get_maintenance_costs_table()[
+        aircraft_cluster_code, flight_phase_code, maintenance_scenario_code], maintenance_exact_value)
+
+    # FUEL COSTS only exact values are available
+    fuel_exact_value, fuel_scenario_code = split_exact_value_and_scenario(get_column(flights, "fuel_costs"),
+                                                                          scenario_code)
+    if (fuel_scenario_code != scenario_code).any():
+        raise FunctionInputParametersError("FUEL")
+    if (fuel_exact_value < 0).any():
+        raise InvalidFuelCostsValueError(fuel_exact_value[fuel_exact_value < 0][0])
+    fuel_costs = np.nan_to_num(fuel_exact_value)
+
+    # CURFEW COSTS
+    curfew_violated = get_column(flights, "curfew_violated", False).astype(bool).to_numpy()
+    curfew_exact_value = pd.to_numeric(get_column(flights, "curfew_costs_exact_value"),
+                                       errors='coerce').to_numpy(dtype=float)
+    if (~curfew_violated & ~np.isnan(curfew_exact_value)).any():
+        raise FunctionInputParametersError("CURFEW")
+    if (curfew_exact_value < 0).any():
+        raise InvalidCurfewCostsValueError(curfew_exact_value[curfew_exact_value < 0][0])
+    curfew = get_column(flights, "curfew")
+    is_curfew_tuple = curfew.map(is_sequence).to_numpy(dtype=bool)
+    curfew_threshold = pd.to_numeric(curfew.map(lambda value: value[0] if is_sequence(value) else value),
+                                     errors='coerce').to_numpy(dtype=float)
+    curfew_passengers = np.where(is_curfew_tuple, pd.to_numeric(curfew.map(
+        lambda value: value[1] if is_sequence(value) else None), errors='coerce').to_numpy(dtype=float),
+                                 passengers_number + number_missed_connection_passengers)
+    curfew_fixed_costs = get_curfew_costs_table()[aircraft_cluster_code]
+    is_curfew_exact_value = curfew_violated & ~np.isnan(curfew_exact_value)
+    is_curfew_estimated = curfew_violated & np.isnan(curfew_exact_value) & ~np.isnan(curfew_threshold)
+    curfew_costs = np.select([is_curfew_exact_value, is_curfew_estimated],
+                             [curfew_exact_value, curfew_passengers * CURFEW_COSTS_PER_PASSENGER + curfew_fixed_costs],
+                             0.)
+    curfew_threshold = np.where(is_curfew_estimated, curfew_threshold, np.nan)
+
+    # PASSENGERS HARD COSTS at each delay threshold
+    # low-cost waiting and reimbursement rates are applied in the low scenario
+    hard_costs = passengers_number[:, np.newaxis] * get_hard_costs_table()[
+        haul_code, (passenger_scenario_code == scenario_codes["LowScenario"]).astype(int)]
+
+    coefficients = pd.DataFrame({
+        "aircraft_type": aircraft_type.to_numpy(),
+        "aircraft_cluster": aircraft_cluster,
+        "flight_phase": flight_phase,
+        "haul_type": np.array(HAULS, dtype=object)[haul_code],
+        "final_cost_scenario": np.array(SCENARIOS, dtype=object)[scenario_code],
+        "final_passenger_scenario": np.array(SCENARIOS, dtype=object)[passenger_scenario_code],
+        "adjusted_passengers_number": passengers_number,
+        "crew_costs": crew_costs,
+        "maintenance_costs": maintenance_costs,
+        "fuel_costs": fuel_costs,
+        "curfew_costs": curfew_costs,
+        "curfew_threshold": curfew_threshold,
+        "missed_connection_passengers": missed_connection_passengers.to_numpy()
+    }, index=flights.index)
+    coefficients[HARD_COSTS_COLUMNS] = hard_costs
+    return coefficients
+
+
+# Names of the cost components evaluated by evaluate_batch_cost_components
+COST_COMPONENTS = ["crew", "maintenance", "hard", "soft", "curfew", "missed_connection"]
+
+
+def evaluate_batch_cost_components(coefficients: pd.DataFrame, delays) -> dict:
+    """Evaluate each cost component of the batch cost coefficients over delays
+    Parameters:
+        coefficients: pd.DataFrame
+            cost coefficients as returned by get_batch_cost_coefficients
+        delays: array-like
+            one-dimensional delays in minutes shared by all flights
+            or two-dimensional delays with one row per flight
+
+        return: dict
+            flights x delays matrix of costs in EUR for each one of the COST_COMPONENTS,
+            as in get_tactical_delay_costs fuel costs are not part of the costs
+        """
+    delays = np.asarray(delays, dtype=float)
+    if delays.ndim == 1:
+        delays = np.broadcast_to(delays, (coefficients.shape[0], delays.shape[0]))
+    components = {}
+
+    # Crew and maintenance costs are linear in delay
+    components["crew"] = coefficients.crew_costs.to_numpy(dtype=float)[:, np.newaxis] * delays
+    components["maintenance"] = coefficients.maintenance_costs.to_numpy(dtype=float)[:, np.newaxis] * delays
+
+    # Hard costs step lookup, the same thresholds are shared by all flights
+    hard_costs_index = np.searchsorted(DELAY_THRESHOLDS, delays, side='right') - 1
+    components["hard"] = np.where(hard_costs_index < 0, 0.,
+                                  np.take_along_axis(coefficients[HARD_COSTS_COLUMNS].to_numpy(dtype=float),
+                                                     np.maximum(hard_costs_index, 0), axis=1))
+
+    # Soft costs interpolated once per passenger scenario
+    passenger_scenario = coefficients.final_passenger_scenario.to_numpy()
+    passengers_number = coefficients.adjusted_passengers_number.to_numpy(dtype=float)
+    components["soft"] = np.zeros(delays.shape)
+    for scenario in np.unique(passenger_scenario):
+        is_scenario = passenger_scenario == scenario
+        components["soft"][is_scenario] = (passengers_number[is_scenario, np.newaxis]
+                                           * get_soft_costs(passengers=1, scenario=scenario)(delays[is_scenario]))
+
+    # Curfew costs charged from the curfew threshold on
+    curfew_threshold = coefficients.curfew_threshold.to_numpy(dtype=float)[:, np.newaxis]
+    components["curfew"] = np.where(np.isnan(curfew_threshold) | (delays >= curfew_threshold),
+                                    coefficients.curfew_costs.to_numpy(dtype=float)[:, np.newaxis], 0.)
+
+    # Missed connection passengers are managed flight by flight
+    components["missed_connection"] = np.zeros(delays.shape)
+    for row, (missed_connection_passengers, scenario, haul) in enumerate(zip(
+            coefficients.missed_connection_passengers, passenger_scenario, coefficients.haul_type)):
+        if is_sequence(missed_connection_passengers) and len(missed_connection_passengers) > 0:
+            components["missed_connection"][row] = get_missed_connection_costs(
+                missed_connection_passengers=missed_connection_passengers, scenario=scenario, haul=haul)(delays[row])
+
+    return components
+
+
+def evaluate_batch_costs(coefficients: pd.DataFrame, delays) -> np.ndarray:
+    """Evaluate the batch cost coefficients over delays
+    Parameters:
+        coefficients: pd.DataFrame
+            cost coefficients as returned by get_batch_cost_coefficients
+        delays: array-like
+            one-dimensional delays in minutes shared by all flights
+            or two-dimensional delays with one row per flight
+
+        return: np.ndarray
+            flights x delays matrix of costs in EUR
+        """
+    components = evaluate_batch_cost_components(coefficients, delays)
+    costs = components["crew"] + components["maintenance"]
+    for component in COST_COMPONENTS[2:]:
+        costs += components[component]
+    return costs
+
+
+def get_tactical_delay_costs_batch(flights, delays=None) -> pd.DataFrame | np.ndarray:
+    """Generate the costs of delay of a whole table of flights, batch version of get_tactical_delay_costs
+    Parameters:
+        flights: pd.DataFrame | pyarrow.Table
+            one row per flight, columns are named as the parameters of get_tactical_delay_costs
+        delays: array-like = None
+            delays in minutes, shared by all flights (1-D) or one row per flight (2-D)
+
+        return: pd.DataFrame | np.ndarray
+            per-flight cost coefficients (see get_batch_cost_coefficients) if delays is None,
+            flights x delays matrix of costs in EUR otherwise
+        """
+    coefficients = get_batch_cost_coefficients(flights)
+    if delays is None:
+        return coefficients
+    return evaluate_batch_costs(coefficients, delays)
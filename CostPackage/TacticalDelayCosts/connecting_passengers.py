@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from CostPackage.TacticalDelayCosts.slot_cost_matrix import get_minutes
+
+# Minimum connection time in minutes between the arrival of the inbound flight and the departure of the onward flight
+MIN_CONNECTION_TIME = 45.
+
+# Delay perceived in minutes by the passengers without a later flight to their destination in the schedule
+UNAVAILABLE_DELAY = 1440.
+
+
+class ConnectionIndex:
+    def __init__(self, schedule):
+        """Onward flights schedule indexed by route (departure airport, destination airport, airline),
+        sorted by scheduled departure (then scheduled arrival) within each route
+
+        schedule: pd.DataFrame | pyarrow.Table
+            one row per onward flight with origin_airport, destination_airport, airline (ICAO codes),
+            scheduled_departure and scheduled_arrival (minutes or datetimes)
+        """
+        schedule = schedule if isinstance(schedule, pd.DataFrame) else schedule.to_pandas()
+        route_codes, self.routes = pd.MultiIndex.from_arrays(
+            [schedule[column].astype(str).str.strip().str.upper()
+             for column in ("origin_airport", "destination_airport", "airline")]).factorize()
+        departures = get_minutes(schedule["scheduled_departure"].to_numpy())
+        arrivals = get_minutes(schedule["scheduled_arrival"].to_numpy())
+        order = np.lexsort((arrivals, departures, route_codes))
+        self.route_codes = route_codes[order]
+        self.departures = departures[order]
+        self.arrivals = arrivals[order]
+        # route and departure as one sorted key: complex numbers are ordered by real part, then imaginary part
+        self.keys = self.route_codes + 1j * self.departures
+
+    # Route codes of the (airport, destination, airline) triples, -1 for the routes not in the schedule
+    def get_route_codes(self, airports, destinations, airlines) -> np.ndarray:
+        return self.routes.get_indexer(pd.MultiIndex.from_arrays(
+            [pd.Series(np.asarray(values, dtype=object)).astype(str).str.strip().str.upper()
+             for values in (airports, destinations, airlines)]))
+
+    # Binary search of departures in their routes: position of the first flight of the route departing at or after
+    # (side left) or after (side right) each departure, -1 where there is none
+    def search(self, route_codes: np.ndarray, departures: np.ndarray, side: str = "left") -> np.ndarray:
+        positions = np.searchsorted(self.keys, route_codes + 1j * departures, side=side)
+        in_route = (route_codes >= 0) & (positions < self.keys.size)
+        in_route[in_route] = self.route_codes[positions[in_route]] == route_codes[in_route]
+        return np.where(in_route, positions, -1)
+
+
+def get_missed_connection_passengers(itineraries, schedule, min_connection_time=MIN_CONNECTION_TIME,
+                                     unavailable_delay: float = UNAVAILABLE_DELAY) -> pd.Series:
+    """Missed connection passengers of each inbound flight from the itineraries of the connecting passengers
+    Parameters:
+        itineraries: pd.DataFrame | pyarrow.Table
+            one row per connecting passenger (or group of passengers with a passengers column) with
+            flight (identifier of the inbound flight), scheduled_arrival of the inbound flight,
+            connection_airport, airline and destination_airport of the booked onward flight and its
+            onward_departure (scheduled departure), times in minutes or datetimes.
+            An optional min_connection_time column overrides min_connection_time
+        schedule: ConnectionIndex | pd.DataFrame | pyarrow.Table
+            onward flights, see ConnectionIndex, the booked onward flights must be part of it
+        min_connection_time: float | dict = 45
+            minimum connection time in minutes, or a dictionary of minimum connection times by airport
+            (ICAO code, airports not in the dictionary have 45 minutes)
+        unavailable_delay: float = 1440
+            delay perceived in minutes by the passengers without a later flight of the same airline
+            to their destination in the schedule
+
+        return: pd.Series
+            list of (delay threshold, delay perceived) tuples of each inbound flight, indexed by flight,
+            as missed_connection_passengers of get_tactical_delay_costs. The delay threshold is the delay
+            of the inbound flight from which the connection is missed (zero if the connection is shorter than
+            the minimum connection time), the delay perceived is the arrival delay at the destination
+            with the next flight of the same airline
+        """
+    index = schedule if isinstance(schedule, ConnectionIndex) else ConnectionIndex(schedule)
+    itineraries = itineraries if isinstance(itineraries, pd.DataFrame) else itineraries.to_pandas()
+    if "passengers" in itineraries.columns:
+        itineraries = itineraries.loc[itineraries.index.repeat(itineraries["passengers"].astype(int))]
+    airports = itineraries["connection_airport"].astype(str).str.strip().str.upper()
+    route_codes = index.get_route_codes(airports, itineraries["destination_airport"], itineraries["airline"])
+    onward_departures = get_minutes(itineraries["onward_departure"].to_numpy())
+
+    booked = index.search(route_codes, onward_departures, side="left")
+    is_booked = booked >= 0
+    is_booked[is_booked] = index.departures[booked[is_booked]] == onward_departures[is_booked]
+    if not is_booked.all():
+        not_booked = itineraries[~is_booked].iloc[0]
+        raise ValueError("Onward flight of " + str(not_booked["airline"]) + " from "
+                         + str(not_booked["connection_airport"]) + " to " + str(not_booked["destination_airport"])
+                         + " departing at " + str(not_booked["onward_departure"]) + " not found in the schedule")
+
+    if isinstance(min_connection_time, dict):
+        connection_times = airports.map(min_connection_time).fillna(MIN_CONNECTION_TIME).to_numpy(dtype=float)
+    else:
+        connection_times = np.full(len(itineraries), float(min_connection_time))
+    if "min_connection_time" in itineraries.columns:
+        itinerary_connection_times = pd.to_numeric(itineraries["min_connection_time"],
+                                                   errors='coerce').to_numpy(dtype=float)
+        connection_times = np.where(np.isnan(itinerary_connection_times), connection_times,
+                                    itinerary_connection_times)
+    thresholds = np.maximum(onward_departures - get_minutes(itineraries["scheduled_arrival"].to_numpy())
+                            - connection_times, 0.)
+
+    # next flight of the route after the booked one, the first one the passenger can take after missing it
+    next_flights = index.search(route_codes, onward_departures, side="right")
+    perceived_delays = np.where(next_flights >= 0,
+                                np.maximum(index.arrivals[next_flights] - index.arrivals[booked], 0.),
+                                unavailable_delay)
+
+    missed_connection_passengers = pd.Series(list(zip(thresholds.tolist(), perceived_delays.tolist())),
+                                             index=itineraries["flight"].to_numpy())
+    return missed_connection_passengers.groupby(level=0, sort=False).agg(list)
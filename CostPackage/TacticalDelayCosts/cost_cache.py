@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple
+
+
+class CostCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+# Bounded least recently used cache of cost components.
+# Entries are keyed on the derived inputs of get_tactical_delay_costs (aircraft cluster, flight phase, haul,
+# scenarios, passengers number, ...) so flights of different aircraft types of the same cluster share an entry.
+# The cached component functions are never modified, cost objects built from the same entry share them
+class CostCache:
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("Cost cache maxsize must be at least 1, got " + str(maxsize))
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    # Cached value of key, built with build() and stored on a miss
+    def get(self, key: Hashable, build: Callable):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        # built outside the lock, errors are not cached
+        value = build()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            return key in self.entries
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CostCacheInfo:
+        with self.lock:
+            return CostCacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+
+# Cache used by get_tactical_delay_costs, None means caching disabled (default)
+cost_cache = None
+
+
+# Enable caching of the cost components built by get_tactical_delay_costs,
+# at most maxsize entries are kept, the least recently used is evicted first
+def enable_cost_cache(maxsize: int = 1024) -> CostCache:
+    global cost_cache
+    cost_cache = CostCache(maxsize)
+    return cost_cache
+
+
+def disable_cost_cache():
+    global cost_cache
+    cost_cache = None
+
+
+def clear_cost_cache():
+    if cost_cache is not None:
+        cost_cache.clear()
+
+
+# hits, misses, evictions, maxsize and current size of the cache, None if caching is disabled
+def get_cost_cache_info() -> CostCacheInfo | None:
+    return None if cost_cache is None else cost_cache.info()
+
+
+# Components of key from the cache if enabled, otherwise (or if key is not hashable) built directly
+def get_cached_cost_components(key: Hashable, build: Callable):
+    cache = cost_cache
+    if cache is None:
+        return build()
+    try:
+        hash(key)
+    except TypeError:
+        return build()
+    return cache.get(key, build)
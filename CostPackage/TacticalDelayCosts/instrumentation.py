@@ -0,0 +1,136 @@
+import functools
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from CostPackage.TacticalDelayCosts import tactical_delay_costs
+from CostPackage.TacticalDelayCosts.cost_cache import clear_cost_cache
+from CostPackage.piecewise_cost_function import PiecewiseCostFunction
+
+# Stages of get_tactical_delay_costs with the functions timed for each stage.
+# get_cost_components is the whole construction of the cost functions, it includes the stages from crew on
+STAGE_FUNCTIONS = {
+    "aircraft_cluster": ["get_aircraft_cluster"],
+    "flight_phase": ["get_flight_phase"],
+    "haul": ["get_haul"],
+    "airport": ["is_valid_airport_icao"],
+    "airline": ["get_airline"],
+    "scenario": ["get_fixed_cost_scenario"],
+    "passengers": ["get_passengers"],
+    "cost_components": ["get_cost_components"],
+    "crew": ["get_crew_costs", "get_crew_costs_from_exact_value"],
+    "maintenance": ["get_maintenance_costs", "get_maintenance_costs_from_exact_value"],
+    "fuel": ["get_fuel_costs_from_exact_value"],
+    "curfew": ["get_curfew_costs", "get_curfew_costs_from_exact_value", "get_curfew_costs_function"],
+    "hard": ["get_hard_costs"],
+    "soft": ["get_soft_costs"],
+    "missed_connection": ["get_missed_connection_costs"],
+    "cost_function": ["get_sum_cost_function"]
+}
+
+
+class StageStats(NamedTuple):
+    calls: int
+    total_time: float
+
+
+# Wall time (seconds) and calls of each stage. Evaluations of the cost functions built while instrumentation
+# is enabled are recorded as <stage>_evaluation e.g. soft_evaluation, cost_function_evaluation
+class Instrumentation:
+    def __init__(self, callback: Callable = None):
+        self.callback = callback
+        self.calls = {}
+        self.total_time = {}
+        self.lock = threading.Lock()
+
+    def record(self, stage: str, elapsed: float):
+        with self.lock:
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+            self.total_time[stage] = self.total_time.get(stage, 0.) + elapsed
+        if self.callback is not None:
+            self.callback(stage, elapsed)
+
+    def clear(self):
+        with self.lock:
+            self.calls.clear()
+            self.total_time.clear()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {stage: StageStats(calls, self.total_time[stage]) for stage, calls in self.calls.items()}
+
+
+# Instrumentation in use, None means disabled (default): get_tactical_delay_costs runs its original functions
+instrumentation = None
+
+# Original functions of tactical_delay_costs replaced by the timed ones
+original_functions = {}
+
+
+# Cost function recording its evaluations, shares the arrays of the function it wraps
+class InstrumentedCostFunction(PiecewiseCostFunction):
+    def __init__(self, function: PiecewiseCostFunction, stage: str):
+        self.breakpoints = function.breakpoints
+        self.coefficients = function.coefficients
+        self.stage = stage
+
+    def __call__(self, delay):
+        recorder = instrumentation
+        if recorder is None:
+            return PiecewiseCostFunction.__call__(self, delay)
+        start = time.perf_counter()
+        value = PiecewiseCostFunction.__call__(self, delay)
+        recorder.record(self.stage, time.perf_counter() - start)
+        return value
+
+
+def get_timed_function(function: Callable, stage: str) -> Callable:
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        recorder = instrumentation
+        if recorder is not None:
+            recorder.record(stage, time.perf_counter() - start)
+        if isinstance(result, PiecewiseCostFunction):
+            result = InstrumentedCostFunction(result, stage + "_evaluation")
+        return result
+
+    return timed_function
+
+
+# Record wall time and calls of each stage of get_tactical_delay_costs and of the evaluations of the cost functions,
+# stats are read with get_instrumentation_stats, callback(stage, elapsed seconds) is also called for each record.
+# Only calls in this process are recorded (not the ones of parallel workers).
+# The cost cache is cleared so that cached functions are built again with instrumentation
+def enable_instrumentation(callback: Callable = None) -> Instrumentation:
+    global instrumentation
+    disable_instrumentation()
+    for stage, names in STAGE_FUNCTIONS.items():
+        for name in names:
+            original_functions[name] = getattr(tactical_delay_costs, name)
+            setattr(tactical_delay_costs, name, get_timed_function(original_functions[name], stage))
+    instrumentation = Instrumentation(callback)
+    clear_cost_cache()
+    return instrumentation
+
+
+# Restore the original functions, get_tactical_delay_costs has no instrumentation overhead anymore
+def disable_instrumentation():
+    global instrumentation
+    for name, function in original_functions.items():
+        setattr(tactical_delay_costs, name, function)
+    if original_functions:
+        clear_cost_cache()
+    original_functions.clear()
+    instrumentation = None
+
+
+def clear_instrumentation_stats():
+    if instrumentation is not None:
+        instrumentation.clear()
+
+
+# Calls and total time in seconds of each stage, None if instrumentation is disabled
+def get_instrumentation_stats() -> dict | None:
+    return None if instrumentation is None else instrumentation.stats()
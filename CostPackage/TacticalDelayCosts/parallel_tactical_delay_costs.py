@@ -0,0 +1,115 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+import numpy as np
+import pandas as pd
+
+from CostPackage.ReferenceData.reference_data import get_reference_cache
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_tactical_delay_costs_batch
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_tactical_delay_costs
+
+
+# Worker initializer: the reference tables are memory-mapped from the binary reference data artifact,
+# all the workers share the same pages of the file instead of each reading the csv files
+def initialize_worker():
+    get_reference_cache()
+
+
+# Costs of one chunk of flights: a table (pd.DataFrame or pyarrow.Table) is costed with the batch version,
+# a list of dictionaries of get_tactical_delay_costs parameters gives the list of cost objects
+def get_chunk_costs(flights, delays=None):
+    if isinstance(flights, list):
+        cost_objects = [get_tactical_delay_costs(**flight) for flight in flights]
+        if delays is None:
+            return cost_objects
+        delays = np.broadcast_to(np.asarray(delays, dtype=float), (len(cost_objects), np.shape(delays)[-1]))
+        return np.array([cost_object.evaluate(flight_delays)
+                         for cost_object, flight_delays in zip(cost_objects, delays)]).reshape(delays.shape)
+    return get_tactical_delay_costs_batch(flights, delays=delays)
+
+
+# Costs of each chunk computed by a pool of processes with chunk_function(*chunk), yielded in input order.
+# At most max_pending chunks are submitted and not yet yielded, chunks are read from the input only when needed
+def get_chunks_costs(chunks: Iterable[tuple], processes: int = None, max_pending: int = None,
+                     chunk_function: Callable = get_chunk_costs) -> Iterator:
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        for chunk in chunks:
+            yield chunk_function(*chunk)
+        return
+
+    # built once here if missing or stale, the workers only map it
+    get_reference_cache()
+    max_pending = max_pending or 2 * processes
+    with ProcessPoolExecutor(max_workers=processes, initializer=initialize_worker) as executor:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(executor.submit(chunk_function, *chunk))
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_tactical_delay_costs_parallel(chunks: Iterable, delays=None, processes: int = None,
+                                       max_pending: int = None) -> Iterator:
+    """Generate the costs of delay of a stream of chunks of flights with a pool of processes,
+    e.g. the chunks of pd.read_csv(file, chunksize=...) for a season of traffic
+    Parameters:
+        chunks: Iterable[pd.DataFrame | pyarrow.Table | list[dict]]
+            chunks of flights, tables with one row per flight as for get_tactical_delay_costs_batch
+            or lists of dictionaries of get_tactical_delay_costs parameters
+        delays: array-like = None
+            delays in minutes, shared by all flights
+        processes: int = None
+            number of worker processes, all the CPUs if None, 1 computes the chunks in the calling process
+        max_pending: int = None
+            maximum number of chunks in progress or waiting to be yielded, twice the processes if None
+
+        return: Iterator
+            the costs of each chunk, in input order: per-flight cost coefficients (pd.DataFrame) or cost objects
+            (list[CostObject]) if delays is None, flights x delays matrix of costs in EUR otherwise
+        """
+    return get_chunks_costs(((flights, delays) for flights in chunks), processes=processes,
+                            max_pending=max_pending)
+
+
+# Chunks of chunk_size rows of a table or of a list of flights, each with its rows of delays if delays are 2-D
+def get_flight_chunks(flights, delays, chunk_size: int) -> Iterator[tuple]:
+    delays = None if delays is None else np.asarray(delays, dtype=float)
+    for start in range(0, len(flights), chunk_size):
+        if isinstance(flights, list):
+            flights_chunk = flights[start:start + chunk_size]
+        elif isinstance(flights, pd.DataFrame):
+            flights_chunk = flights.iloc[start:start + chunk_size]
+        else:
+            flights_chunk = flights.slice(start, chunk_size)
+        yield flights_chunk, delays if delays is None or delays.ndim == 1 else delays[start:start + chunk_size]
+
+
+def get_tactical_delay_costs_parallel(flights, delays=None, processes: int = None,
+                                      chunk_size: int = 10000) -> pd.DataFrame | np.ndarray | list:
+    """Generate the costs of delay of a large list of flights splitting it across a pool of processes
+    Parameters:
+        flights: pd.DataFrame | pyarrow.Table | list[dict]
+            one row per flight as for get_tactical_delay_costs_batch,
+            or a list of dictionaries of get_tactical_delay_costs parameters
+        delays: array-like = None
+            delays in minutes, shared by all flights (1-D) or one row per flight (2-D)
+        processes: int = None
+            number of worker processes, all the CPUs if None
+        chunk_size: int = 10000
+            number of flights costed by a worker at a time
+
+        return: pd.DataFrame | list[CostObject] | np.ndarray
+            per-flight cost coefficients or cost objects if delays is None,
+            flights x delays matrix of costs in EUR otherwise, in input order
+        """
+    results = list(get_chunks_costs(get_flight_chunks(flights, delays, chunk_size), processes=processes))
+    if delays is not None:
+        return (np.concatenate(results) if results
+                else np.empty((0, np.shape(delays)[-1])))
+    if isinstance(flights, list):
+        return [cost_object for cost_objects in results for cost_object in cost_objects]
+    return pd.concat(results) if results else get_tactical_delay_costs_batch(flights)
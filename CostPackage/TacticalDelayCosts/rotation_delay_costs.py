@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, \
+    evaluate_batch_costs
+from CostPackage.TacticalDelayCosts.slot_cost_matrix import get_minutes
+
+# Minimum turnaround time in minutes between the arrival of a leg and the departure of the next leg of the aircraft
+MIN_TURNAROUND = 30.
+
+
+class RotationSchedule:
+    def __init__(self, schedule, min_turnaround: float = MIN_TURNAROUND, tail_number: str = "tail_number",
+                 departure: str = "scheduled_departure", arrival: str = "scheduled_arrival"):
+        """Legs of the aircraft rotations, indexed once for the propagation of delays along the rotations
+
+        schedule: pd.DataFrame | pyarrow.Table
+            one row per leg with the tail number, scheduled departure and arrival (minutes or datetimes),
+            and the columns of get_tactical_delay_costs_batch (flight_phase_input is AT_GATE if not provided),
+            an optional min_turnaround column overrides min_turnaround for each leg
+
+        min_turnaround: float = 30
+            minimum turnaround time in minutes before the departure of a leg
+
+        tail_number, departure, arrival: str
+            names of the columns of the tail numbers and of the scheduled times
+
+        Legs are sorted by tail number and scheduled departure. The buffer of a leg is its scheduled ground time
+        after the previous leg of the aircraft minus the minimum turnaround time, a delay of the previous leg
+        is absorbed by the buffer and the rest is passed on (reactionary delay). Ground times shorter than
+        the minimum turnaround time have no buffer: the schedule is taken as feasible, only primary delays
+        are passed on. Arrival delays are taken equal to departure delays (no recovery en route)
+        """
+        schedule = schedule if isinstance(schedule, pd.DataFrame) else schedule.to_pandas()
+        self.schedule = schedule
+        self.size = len(schedule)
+        tail_codes = pd.factorize(schedule[tail_number])[0]
+        departures = get_minutes(schedule[departure].to_numpy())
+        arrivals = get_minutes(schedule[arrival].to_numpy())
+        min_turnarounds = (pd.to_numeric(schedule["min_turnaround"], errors='coerce').fillna(min_turnaround)
+                           .to_numpy(dtype=float) if "min_turnaround" in schedule.columns
+                           else np.full(self.size, float(min_turnaround)))
+
+        # rotation index: previous and next leg of the same aircraft (-1 for the first and last leg)
+        # and position in the rotation
+        order = np.lexsort((departures, tail_codes))
+        is_first = np.ones(self.size, dtype=bool)
+        is_first[1:] = tail_codes[order[1:]] != tail_codes[order[:-1]]
+        self.previous_leg = np.full(self.size, -1)
+        self.previous_leg[order[~is_first]] = order[np.flatnonzero(~is_first) - 1]
+        has_previous_leg = self.previous_leg >= 0
+        self.next_leg = np.full(self.size, -1)
+        self.next_leg[self.previous_leg[has_previous_leg]] = np.flatnonzero(has_previous_leg)
+        rotation_starts = np.flatnonzero(is_first)
+        self.position = np.empty(self.size, dtype=int)
+        self.position[order] = np.arange(self.size) - np.repeat(rotation_starts, np.diff(
+            np.append(rotation_starts, self.size)))
+        self.buffers = np.where(has_previous_leg, np.maximum(
+            departures - arrivals[np.maximum(self.previous_leg, 0)] - min_turnarounds, 0.), np.inf)
+        # legs grouped by position in the rotation, each group is propagated at once
+        by_position = np.argsort(self.position, kind="stable")
+        self.position_groups = np.split(by_position, np.flatnonzero(np.diff(self.position[by_position])) + 1)
+
+        flights = schedule.copy()
+        if "flight_phase_input" not in flights.columns:
+            flights["flight_phase_input"] = "AT_GATE"
+        flights["flight_phase_input"] = flights["flight_phase_input"].fillna("AT_GATE")
+        self.coefficients = get_batch_cost_coefficients(flights)
+
+    # Primary delays of the legs as legs x candidates minutes
+    def get_primary_delays(self, primary_delays) -> np.ndarray:
+        primary_delays = np.asarray(primary_delays, dtype=float)
+        primary_delays = primary_delays.reshape(self.size, -1)
+        if (primary_delays < 0).any():
+            raise ValueError("Primary delays must be >= 0")
+        return primary_delays
+
+    def propagate(self, primary_delays) -> np.ndarray:
+        """Delays of all the legs, primary delays and reactionary delays from the previous legs of the aircraft
+
+        primary_delays: array-like
+            primary delay in minutes of each leg (schedule order), one column per candidate (legs x candidates)
+
+        return: np.ndarray
+            legs x candidates delays in minutes, the largest of the primary and the reactionary delay of each leg
+        """
+        delays = self.get_primary_delays(primary_delays).copy()
+        for legs in self.position_groups[1:]:
+            reactionary_delays = delays[self.previous_leg[legs]] - self.buffers[legs, np.newaxis]
+            delays[legs] = np.maximum(delays[legs], reactionary_delays)
+        return delays
+
+    # Legs x candidates costs in EUR of the propagated delays, zero for the legs not delayed
+    def get_costs(self, primary_delays) -> np.ndarray:
+        delays = self.propagate(primary_delays)
+        return np.where(delays > 0, evaluate_batch_costs(self.coefficients, delays), 0.)
+
+    # Total costs in EUR of the whole schedule, one for each candidate
+    def get_network_costs(self, primary_delays) -> np.ndarray:
+        return self.get_costs(primary_delays).sum(axis=0)
+
+    # The leg and the following legs of its aircraft, in rotation order
+    def get_following_legs(self, leg: int) -> np.ndarray:
+        legs = [leg]
+        while self.next_leg[legs[-1]] >= 0:
+            legs.append(self.next_leg[legs[-1]])
+        return np.array(legs)
+
+
+def get_reactionary_delay_costs(schedule: RotationSchedule, leg: int, initial_delays) -> np.ndarray:
+    """Costs of delaying one leg, the delay is propagated through the following legs of the aircraft
+    Parameters:
+        schedule: RotationSchedule
+            legs of the aircraft rotations
+        leg: int
+            position of the delayed leg in the schedule table
+        initial_delays: array-like
+            candidate delays of the leg in minutes
+
+        return: np.ndarray
+            costs in EUR of the delayed leg and of the following legs of the aircraft, one for each candidate delay.
+            The other legs have no delay
+        """
+    initial_delays = np.asarray(initial_delays, dtype=float).reshape(-1)
+    if (initial_delays < 0).any():
+        raise ValueError("Primary delays must be >= 0")
+    legs = schedule.get_following_legs(leg)
+    # only the legs of the aircraft from the delayed one on are propagated and costed
+    delays = np.empty((legs.size, initial_delays.size))
+    delays[0] = initial_delays
+    for position in range(1, legs.size):
+        delays[position] = np.maximum(delays[position - 1] - schedule.buffers[legs[position]], 0.)
+    costs = evaluate_batch_costs(schedule.coefficients.iloc[legs], delays)
+    return np.where(delays > 0, costs, 0.).sum(axis=0)
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+from CostPackage.Aircraft.aircraft_profile import get_aircraft_profiles, get_aircraft_profile_index
+from CostPackage.Crew.crew_costs import get_crew_costs_table
+from CostPackage.Curfew.curfew_costs import get_curfew_costs_table, CURFEW_COSTS_PER_PASSENGER
+from CostPackage.FlightPhase.flight_phase import flight_phase_codes
+from CostPackage.Haul.haul import haul_codes
+from CostPackage.Maintenance.maintenance_costs import get_maintenance_costs_table
+from CostPackage.Passenger.Hard.hard_costs import get_hard_costs_table, DELAY_THRESHOLDS
+from CostPackage.Passenger.Soft.soft_costs import get_soft_costs
+from CostPackage.Passenger.missed_connection import get_missed_connection_costs
+from CostPackage.Scenario.scenario import get_scenario_code, scenario_codes, SCENARIOS
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, get_column, \
+    is_sequence, split_exact_value_and_scenario
+
+# Axes of the costs of a scenario sweep
+SWEEP_DIMENSIONS = ("flight", "crew_scenario", "maintenance_scenario", "passenger_scenario", "delay")
+
+# Passengers load factor of each scenario (in SCENARIOS order), wide-body aircraft are at .85 in all of them
+LOAD_FACTORS = np.array([.65, .80, .95])
+
+
+class ScenarioSweep:
+    def __init__(self, costs: np.ndarray, flights: pd.Index, delays: np.ndarray, default_scenario_codes: np.ndarray):
+        """Costs of delay of many flights under every combination of crew, maintenance and passenger scenarios
+
+        costs: np.ndarray
+            costs in EUR indexed by [flight, crew scenario, maintenance scenario, passenger scenario, delay],
+            scenario axes in SCENARIOS order (low, base, high)
+
+        flights: pd.Index
+            labels of the flights (index of the flights table)
+
+        delays: np.ndarray
+            delays in minutes
+
+        default_scenario_codes: np.ndarray
+            flights x 3 codes of the crew, maintenance and passenger scenarios get_tactical_delay_costs would use
+            for each flight (low for LCC, high for group 1 destination airports, base otherwise,
+            unless set in the flights table)
+        """
+        self.costs = costs
+        self.flights = flights
+        self.delays = delays
+        self.scenarios = SCENARIOS
+        self.default_scenario_codes = default_scenario_codes
+
+    # Costs of some of the scenarios, e.g. sel(crew="high", passengers="low")
+    # is indexed by [flight, maintenance scenario, delay]
+    def sel(self, crew: str = None, maintenance: str = None, passengers: str = None) -> np.ndarray:
+        return self.costs[(slice(None), *(slice(None) if scenario is None else get_scenario_code(scenario)
+                                          for scenario in (crew, maintenance, passengers)))]
+
+    # Flights x delays costs at the scenarios of each flight, as from get_tactical_delay_costs
+    def get_default_costs(self) -> np.ndarray:
+        return self.costs[(np.arange(self.flights.size), *self.default_scenario_codes.T)]
+
+    # One row per flight and combination of scenarios, one column per delay
+    def to_dataframe(self) -> pd.DataFrame:
+        index = pd.MultiIndex.from_product([self.flights, SCENARIOS, SCENARIOS, SCENARIOS],
+                                           names=list(SWEEP_DIMENSIONS[:-1]))
+        return pd.DataFrame(self.costs.reshape(-1, self.delays.size), index=index, columns=self.delays)
+
+
+def get_scenario_sweep(flights, delays) -> ScenarioSweep:
+    """Costs of delay of a table of flights under all the 27 combinations of low, base and high crew, maintenance
+    and passenger scenarios. Aircraft cluster, flight phase, haul, missed connection passengers and curfew are
+    resolved once for all the combinations, crew and maintenance rates and passenger costs once per scenario
+    Parameters:
+        flights: pd.DataFrame | pyarrow.Table | list[dict]
+            one row per flight, columns are named as the parameters of get_tactical_delay_costs.
+            Exact crew and maintenance costs (numbers) are kept in all the scenarios of their axis,
+            passengers numbers are kept in all the passenger scenarios (only the costs per passenger change),
+            otherwise the number of passengers follows the load factor of the passenger scenario.
+            Scenarios set in the table only change the default scenarios of the sweep.
+            LCC airlines (is_low_cost_airline or airline) have the low scenarios by default
+        delays: array-like
+            delays in minutes shared by all flights
+
+        return: ScenarioSweep
+            costs indexed by [flight, crew scenario, maintenance scenario, passenger scenario, delay],
+            flights x 27 x delays values
+        """
+    flights = pd.DataFrame(flights) if isinstance(flights, list) else flights
+    flights = flights if isinstance(flights, pd.DataFrame) else flights.to_pandas()
+    delays = np.asarray(delays, dtype=float).reshape(-1)
+    # inputs validated and scenario independent parameters resolved once
+    coefficients = get_batch_cost_coefficients(flights)
+    aircraft_profiles = get_aircraft_profiles()[
+        coefficients.aircraft_type.map(get_aircraft_profile_index()).to_numpy(dtype=np.intp)]
+    aircraft_cluster_code = aircraft_profiles["aircraft_cluster_code"].astype(int)
+    flight_phase_code = coefficients.flight_phase.map(flight_phase_codes).to_numpy(dtype=int)
+    haul_code = coefficients.haul_type.map(haul_codes).to_numpy(dtype=int)
+    scenario_code = coefficients.final_cost_scenario.map(scenario_codes).to_numpy(dtype=int)
+
+    # CREW and MAINTENANCE COSTS in EUR/min, flights x scenarios
+    crew_exact_value, crew_scenario_code = split_exact_value_and_scenario(get_column(flights, "crew_costs"),
+                                                                          scenario_code)
+    crew_costs = np.where(np.isnan(crew_exact_value)[:, np.newaxis], get_crew_costs_table()[aircraft_cluster_code],
+                          crew_exact_value[:, np.newaxis])
+    maintenance_exact_value, maintenance_scenario_code = split_exact_value_and_scenario(
+        get_column(flights, "maintenance_costs"), scenario_code)
+    maintenance_costs = np.where(np.isnan(maintenance_exact_value)[:, np.newaxis],
+                                 get_maintenance_costs_table()[aircraft_cluster_code, flight_phase_code],
+                                 maintenance_exact_value[:, np.newaxis])
+
+    # PASSENGERS number, flights x passenger scenarios
+    missed_connection_passengers = coefficients.missed_connection_passengers
+    number_missed_connection_passengers = missed_connection_passengers.map(
+        lambda passengers: len(passengers) if is_sequence(passengers) else 0).to_numpy(dtype=int)
+    passengers_exact_value, _ = split_exact_value_and_scenario(get_column(flights, "passengers"), scenario_code)
+    load_factor = np.where(aircraft_profiles["wide_body"][:, np.newaxis], .85, LOAD_FACTORS)
+    passengers_number = np.where(np.isnan(passengers_exact_value)[:, np.newaxis],
+                                 np.round(aircraft_profiles["seats"] * load_factor),
+                                 (passengers_exact_value - number_missed_connection_passengers)[:, np.newaxis])
+
+    # PASSENGER COSTS, flights x passenger scenarios x delays
+    # hard costs: low-cost waiting and reimbursement rates are applied in the low scenario
+    hard_costs_per_passenger = get_hard_costs_table()[haul_code][:, [int(scenario == "LowScenario")
+                                                                     for scenario in SCENARIOS]]
+    hard_costs_index = np.searchsorted(DELAY_THRESHOLDS, delays, side='right') - 1
+    passenger_costs = passengers_number[:, :, np.newaxis] * (
+        np.where(hard_costs_index < 0, 0., hard_costs_per_passenger[:, :, np.maximum(hard_costs_index, 0)])
+        + np.array([get_soft_costs(passengers=1, scenario=scenario)(delays) for scenario in SCENARIOS]))
+
+    # curfew costs estimated from the passengers on board change with the passenger scenario
+    curfew_threshold = coefficients.curfew_threshold.to_numpy(dtype=float)
+    is_curfew_passengers_on_board = ~np.isnan(curfew_threshold) & ~get_column(flights, "curfew").map(
+        is_sequence).to_numpy(dtype=bool)
+    curfew_costs = np.where(is_curfew_passengers_on_board[:, np.newaxis],
+                            (passengers_number + number_missed_connection_passengers[:, np.newaxis])
+                            * CURFEW_COSTS_PER_PASSENGER + get_curfew_costs_table()[aircraft_cluster_code, np.newaxis],
+                            coefficients.curfew_costs.to_numpy(dtype=float)[:, np.newaxis])
+    is_curfew_charged = np.isnan(curfew_threshold)[:, np.newaxis] | (delays >= curfew_threshold[:, np.newaxis])
+    passenger_costs += np.where(is_curfew_charged[:, np.newaxis, :], curfew_costs[:, :, np.newaxis], 0.)
+
+    for row, (passengers, haul) in enumerate(zip(missed_connection_passengers, coefficients.haul_type)):
+        if is_sequence(passengers) and len(passengers) > 0:
+            for code, scenario in enumerate(SCENARIOS):
+                passenger_costs[row, code] += get_missed_connection_costs(
+                    missed_connection_passengers=passengers, scenario=scenario, haul=haul)(delays)
+
+    costs = ((crew_costs[:, :, np.newaxis, np.newaxis, np.newaxis]
+              + maintenance_costs[:, np.newaxis, :, np.newaxis, np.newaxis]) * delays
+             + passenger_costs[:, np.newaxis, np.newaxis, :, :])
+    default_scenario_codes = np.stack([crew_scenario_code, maintenance_scenario_code,
+                                       coefficients.final_passenger_scenario.map(scenario_codes).to_numpy(dtype=int)],
+                                      axis=1)
+    return ScenarioSweep(costs, flights.index, delays, default_scenario_codes)
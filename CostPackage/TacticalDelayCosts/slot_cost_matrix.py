@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, \
+    evaluate_batch_costs
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_tactical_delay_costs
+
+
+# Times in minutes: numbers are taken as minutes, datetimes as minutes since the epoch
+def get_minutes(times) -> np.ndarray:
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return (times - np.datetime64(0, "s")) / np.timedelta64(1, "m")
+    return times.astype(float)
+
+
+# Evaluator of the flights costs over a flights x points matrix of delays:
+# tables are resolved once with the batch coefficients, cost objects are evaluated row by row
+def get_costs_evaluator(flights):
+    if isinstance(flights, list):
+        cost_objects = [get_tactical_delay_costs(**flight) if isinstance(flight, dict) else flight
+                        for flight in flights]
+        return lambda delays: np.array([cost_object.evaluate(flight_delays) for cost_object, flight_delays
+                                        in zip(cost_objects, delays)]).reshape(delays.shape)
+    coefficients = get_batch_cost_coefficients(flights)
+    return lambda delays: evaluate_batch_costs(coefficients, delays)
+
+
+# Feasible slots of each flight (slot >= estimated time, delay <= max_delay) as compressed sparse rows:
+# slot indexes and delays of each flight one after the other, row_starts[i]:row_starts[i + 1] for flight i
+def get_feasible_slots(estimated_times: np.ndarray, slot_times: np.ndarray,
+                       max_delay: float = np.inf) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = np.argsort(slot_times, kind="stable")
+    sorted_slot_times = slot_times[order]
+    first = np.searchsorted(sorted_slot_times, estimated_times, side="left")
+    last = np.searchsorted(sorted_slot_times, estimated_times + max_delay, side="right")
+    counts = last - first
+    row_starts = np.concatenate(([0], np.cumsum(counts)))
+    # position of each feasible slot in the sorted slots: first slot of its flight plus its rank in the window
+    rows = np.repeat(np.arange(estimated_times.size), counts)
+    positions = first[rows] + np.arange(row_starts[-1]) - row_starts[rows]
+    return row_starts, order[positions], sorted_slot_times[positions] - estimated_times[rows]
+
+
+def get_slot_cost_matrix(flights, estimated_times, slot_times, max_delay: float = None, sparse: bool = False,
+                         infeasible_cost: float = np.inf):
+    """Costs of delay of assigning each flight of a regulation to each slot
+    Parameters:
+        flights: pd.DataFrame | pyarrow.Table | list[dict] | list[CostObject]
+            one row per flight as for get_tactical_delay_costs_batch, a list of dictionaries of
+            get_tactical_delay_costs parameters or the cost objects of the flights
+        estimated_times: array-like | str
+            estimated time of each flight (e.g. ETA at the regulated airport or sector), in minutes or datetimes,
+            or the name of the column of flights holding them
+        slot_times: array-like
+            times of the slots of the regulation, same unit of estimated_times
+        max_delay: float = None
+            maximum delay in minutes, slots later than estimated time + max_delay are not feasible,
+            no maximum if None
+        sparse: bool = False
+            if True only the feasible slots are costed and stored
+        infeasible_cost: float = np.inf
+            cost of the slots before the estimated time or beyond max_delay in the dense matrix
+
+        return: np.ndarray | scipy.sparse.csr_matrix
+            flights x slots matrix of costs in EUR of the delay slot time - estimated time.
+            The sparse matrix (requires scipy) stores all the feasible slots, zero costs included,
+            the slots not stored are the infeasible ones
+        """
+    if isinstance(estimated_times, str):
+        estimated_times = (flights[estimated_times] if isinstance(flights, pd.DataFrame)
+                           else flights.column(estimated_times).to_pandas())
+    estimated_times = get_minutes(estimated_times).reshape(-1)
+    slot_times = get_minutes(slot_times).reshape(-1)
+    if estimated_times.size != len(flights):
+        raise ValueError("One estimated time per flight is needed, got " + str(estimated_times.size)
+                         + " estimated times for " + str(len(flights)) + " flights")
+    max_delay = np.inf if max_delay is None else float(max_delay)
+    evaluate_costs = get_costs_evaluator(flights)
+
+    if not sparse:
+        delays = slot_times[np.newaxis, :] - estimated_times[:, np.newaxis]
+        feasible = (delays >= 0) & (delays <= max_delay)
+        # infeasible slots are costed at zero delay and then replaced
+        return np.where(feasible, evaluate_costs(np.where(feasible, delays, 0.)), infeasible_cost)
+
+    from scipy.sparse import csr_matrix
+    row_starts, slot_indexes, delays = get_feasible_slots(estimated_times, slot_times, max_delay)
+    # flights x widest window matrix of delays, padded with zero delays beyond the window of each flight
+    counts = np.diff(row_starts)
+    width = counts.max(initial=0)
+    in_window = np.arange(width) < counts[:, np.newaxis]
+    window_delays = np.zeros((estimated_times.size, width))
+    window_delays[in_window] = delays
+    costs = evaluate_costs(window_delays)[in_window] if width > 0 else delays
+    matrix = csr_matrix((costs, slot_indexes, row_starts), shape=(estimated_times.size, slot_times.size))
+    matrix.sort_indices()
+    return matrix
@@ -1,5 +1,258 @@
 from CostPackage.TacticalDelayCosts import *
 from CostPackage.cost_object import CostObject
+from CostPackage.piecewise_cost_function import get_constant_cost_function, get_sum_cost_function
+from CostPackage.TacticalDelayCosts.cost_cache import get_cached_cost_components
+
+
+class FunctionInputParametersError(Exception):
+    def __init__(self, conflict_type: str):
+        self.conflict_type = conflict_type
+        self.message = ("Conflict between exact value and scenario for: " + self.conflict_type
+                        + " Cannot both be non None")
+
+    def __repr__(self):
+        return "Conflict between exact value and scenario for: " + self.conflict_type + " Cannot both be non None"
+
+
+ZERO_COSTS = get_constant_cost_function(0.)
+
+
+# Zero costs function if both scenario and exact value are None, cost functions are immutable and shared
+def zero_costs():
+    return ZERO_COSTS
+
+
+# CREW COSTS
+def get_crew_costs_component(aircraft_cluster: str, scenario: str, crew_costs: float | str):
+    # NO crew costs input, either manage as zero costs or choose a default scenario
+    if crew_costs is None:
+        # total_crew_costs = zero_costs()
+        return get_crew_costs(aircraft_cluster=aircraft_cluster, scenario=scenario)
+    # Crew costs based on exact value
+    elif type(crew_costs) is float:
+        return get_crew_costs_from_exact_value(crew_costs)
+    # Crew cost estimation based on scenario
+    elif type(crew_costs) is str:
+        return get_crew_costs(aircraft_cluster=aircraft_cluster, scenario=crew_costs)
+    else:
+        raise FunctionInputParametersError("CREW")
+
+
+# MAINTENANCE COSTS
+def get_maintenance_costs_component(aircraft_cluster: str, flight_phase: str, scenario: str,
+                                    maintenance_costs: float | str):
+    # NO maintenance costs input,  either manage as zero costs or choose a default scenario
+    if maintenance_costs is None:
+        # total_maintenance_costs = zero_costs()
+        return get_maintenance_costs(aircraft_cluster=aircraft_cluster, scenario=scenario, flight_phase=flight_phase)
+    # Maintenance costs based on exact value
+    elif type(maintenance_costs) is float:
+        return get_maintenance_costs_from_exact_value(maintenance_costs)
+    # Maintenance costs based on scenario
+    elif type(maintenance_costs) is str:
+        return get_maintenance_costs(aircraft_cluster=aircraft_cluster, scenario=maintenance_costs,
+                                     flight_phase=flight_phase)
+    else:
+        raise FunctionInputParametersError("MAINTENANCE")
+
+
+# FUEL COSTS
+def get_fuel_costs_component(fuel_costs: float | str):
+    # No fuel costs input,  either manage as zero costs or choose a default scenario
+    if fuel_costs is None:
+        return zero_costs()
+        # total_fuel_costs = get_fuel_costs(aircraft_cluster=aircraft_cluster, scenario=scenario,
+        # flight_phase=flight_phase)
+    # Fuel costs based on exact value
+    elif type(fuel_costs) is float:
+        return get_fuel_costs_from_exact_value(fuel_costs)
+    # Fuel costs based on scenario
+    # elif type(fuel_costs) is str:
+    #     total_fuel_costs = get_fuel_costs(aircraft_cluster=aircraft_cluster,
+    #                                 scenario=fuel_costs, flight_phase=flight_phase)
+    else:
+        raise FunctionInputParametersError("FUEL")
+
+
+# CURFEW COSTS, the curfew passengers are all the passengers on board if not provided
+def get_curfew_costs_component(aircraft_cluster: str, all_passengers_number: int, curfew_violated: bool,
+                               curfew_costs_exact_value: float, curfew: tuple[float, int] | float):
+    # Curfew not violated and no curfew costs provided
+    if curfew_violated is False and curfew_costs_exact_value is None:
+        return zero_costs()
+    # Curfew costs base on exact value
+    elif curfew_costs_exact_value is not None and curfew_violated is True:
+        return get_curfew_costs_function(get_curfew_costs_from_exact_value(curfew_costs_exact_value))
+    elif curfew_violated is True and curfew is None:
+        return zero_costs()
+    elif curfew_violated is True and curfew is not None:
+        curfew_threshold = curfew[0] if isinstance(curfew, tuple) else curfew
+        curfew_passengers = curfew[1] if isinstance(curfew, tuple) else all_passengers_number
+        return get_curfew_costs_function(
+            get_curfew_costs(aircraft_cluster=aircraft_cluster, curfew_passengers=curfew_passengers),
+            curfew_threshold=curfew_threshold)
+    else:  # Both parameters are not None, situation managed as a conflict
+        raise FunctionInputParametersError("CURFEW")
+
+
+# PASSENGER COSTS of the passengers who didn't lose the connection
+def get_passengers_costs_components(passenger_scenario: str, passengers_number: int, haul: str) -> tuple:
+    return (get_hard_costs(passengers=passengers_number, scenario=passenger_scenario, haul=haul),
+            get_soft_costs(passengers=passengers_number, scenario=passenger_scenario))
+
+
+# Soft and Hard costs of passengers with missed connection
+def get_missed_connection_costs_component(passenger_scenario: str, haul: str,
+                                          missed_connection_passengers: List[Tuple]):
+    if missed_connection_passengers is None or len(missed_connection_passengers) == 0:
+        return zero_costs()
+    return get_missed_connection_costs(missed_connection_passengers=missed_connection_passengers,
+                                       scenario=passenger_scenario, haul=haul)
+
+
+# One piecewise function, the components are added exactly (fuel costs are not included)
+def get_total_cost_function(total_crew_costs, total_maintenance_costs, curfew_costs, passengers_hard_costs,
+                            passengers_soft_costs, missed_connection_costs):
+    passengers_costs = [passengers_hard_costs, passengers_soft_costs]
+    if missed_connection_costs is not ZERO_COSTS:
+        passengers_costs.append(missed_connection_costs)
+    return get_sum_cost_function([total_maintenance_costs, total_crew_costs, *passengers_costs, curfew_costs])
+
+
+# Component cost functions of a flight from its derived inputs, the inputs are part of the cost cache key
+def get_cost_components(aircraft_cluster: str, flight_phase: str, haul: str, scenario: str, passenger_scenario: str,
+                        passengers_number: int, crew_costs: float | str, maintenance_costs: float | str,
+                        fuel_costs: float | str, curfew_violated: bool, curfew_costs_exact_value: float,
+                        curfew: tuple[float, int] | float, missed_connection_passengers: List[Tuple]) -> tuple:
+    number_missed_connection_passengers = 0 if missed_connection_passengers is None else len(
+        missed_connection_passengers)
+
+    total_crew_costs = get_crew_costs_component(aircraft_cluster, scenario, crew_costs)
+    total_maintenance_costs = get_maintenance_costs_component(aircraft_cluster, flight_phase, scenario,
+                                                              maintenance_costs)
+    total_fuel_costs = get_fuel_costs_component(fuel_costs)
+    curfew_costs = get_curfew_costs_component(aircraft_cluster,
+                                              passengers_number + number_missed_connection_passengers,
+                                              curfew_violated, curfew_costs_exact_value, curfew)
+    passengers_hard_costs, passengers_soft_costs = get_passengers_costs_components(passenger_scenario,
+                                                                                   passengers_number, haul)
+    missed_connection_costs = get_missed_connection_costs_component(passenger_scenario, haul,
+                                                                    missed_connection_passengers)
+    cost_function = get_total_cost_function(total_crew_costs, total_maintenance_costs, curfew_costs,
+                                            passengers_hard_costs, passengers_soft_costs, missed_connection_costs)
+
+    return (total_crew_costs, total_maintenance_costs, total_fuel_costs, curfew_costs,
+            passengers_hard_costs, passengers_soft_costs, missed_connection_costs, cost_function)
+
+
+# Keeps the current value of a parameter of get_updated_cost_object
+UNCHANGED = object()
+
+
+def get_updated_cost_object(cost_object: CostObject, flight_phase_input: str = UNCHANGED,
+                            passengers: int | str = UNCHANGED,
+                            missed_connection_passengers: List[Tuple] = UNCHANGED) -> CostObject:
+    """Cost object of the same flight with some updated inputs, only the cost functions depending on them
+    are built again: maintenance costs for the flight phase, passengers hard, soft and curfew costs for the passengers,
+    missed connection costs for the missed connection passengers. The other cost functions are shared
+    Parameters:
+        cost_object: CostObject
+            cost object built by get_tactical_delay_costs
+        flight_phase_input: str
+            can be AT_GATE, TAXI or EN_ROUTE
+        passengers: int | str
+            number of passengers (missed connection passengers included) or passengers scenario, as
+            in get_tactical_delay_costs
+        missed_connection_passengers: List[Tuple]
+            all the missed connection passengers of the flight, as in get_tactical_delay_costs
+
+        return: CostObject
+        """
+    if cost_object.aircraft_cluster is None:
+        raise AircraftClusterError(str(cost_object.aircraft_type))
+    aircraft_cluster = cost_object.aircraft_cluster
+    haul = cost_object.haul_type
+    scenario = cost_object.final_cost_scenario
+
+    if flight_phase_input is UNCHANGED:
+        flight_phase_input = cost_object.flight_phase_input
+    flight_phase = get_flight_phase(flight_phase_input.strip().upper())
+
+    if passengers is UNCHANGED:
+        passengers = cost_object.passengers
+    if missed_connection_passengers is UNCHANGED:
+        missed_connection_passengers = cost_object.missed_connection_passengers
+    number_missed_connection_passengers = 0 if missed_connection_passengers is None else len(
+        missed_connection_passengers)
+
+    # passengers as in get_tactical_delay_costs
+    if passengers is None or type(passengers) is str:
+        passenger_scenario = scenario if passengers is None else passengers
+        passengers_number = get_passengers(aircraft_type=aircraft_cluster, scenario=passenger_scenario)
+    elif type(passengers) is int:
+        passenger_scenario = scenario
+        passengers_number = passengers - number_missed_connection_passengers
+    else:
+        raise FunctionInputParametersError("PASSENGERS")
+
+    total_maintenance_costs = cost_object.total_maintenance_costs_function
+    if flight_phase != cost_object.flight_phase:
+        total_maintenance_costs = get_maintenance_costs_component(aircraft_cluster, flight_phase, scenario,
+                                                                  cost_object.maintenance_costs)
+
+    passengers_hard_costs = cost_object.passengers_hard_costs_function
+    passengers_soft_costs = cost_object.passengers_soft_costs_function
+    if (passenger_scenario, passengers_number) != (cost_object.final_passenger_scenario,
+                                                   cost_object.adjusted_passengers_number):
+        passengers_hard_costs, passengers_soft_costs = get_passengers_costs_components(passenger_scenario,
+                                                                                       passengers_number, haul)
+
+    missed_connection_costs = cost_object.missed_connection_costs_function
+    if (passenger_scenario != cost_object.final_passenger_scenario
+            or missed_connection_passengers != cost_object.missed_connection_passengers):
+        missed_connection_costs = get_missed_connection_costs_component(passenger_scenario, haul,
+                                                                        missed_connection_passengers)
+
+    curfew_costs = cost_object.curfew_costs_function
+    previous_number_missed_connection_passengers = (0 if cost_object.missed_connection_passengers is None
+                                                    else len(cost_object.missed_connection_passengers))
+    if (passengers_number + number_missed_connection_passengers
+            != cost_object.adjusted_passengers_number + previous_number_missed_connection_passengers):
+        curfew_costs = get_curfew_costs_component(aircraft_cluster,
+                                                  passengers_number + number_missed_connection_passengers,
+                                                  cost_object.curfew_violated, cost_object.curfew_costs_exact_value,
+                                                  cost_object.curfew)
+
+    changed_components = [(previous_component, component) for previous_component, component in (
+        (cost_object.total_maintenance_costs_function, total_maintenance_costs),
+        (cost_object.passengers_hard_costs_function, passengers_hard_costs),
+        (cost_object.passengers_soft_costs_function, passengers_soft_costs),
+        (cost_object.missed_connection_costs_function, missed_connection_costs),
+        (cost_object.curfew_costs_function, curfew_costs)) if component is not previous_component]
+    if not changed_components:
+        cost_function = cost_object.cost_function
+    # only linear components changed (e.g. maintenance costs of the new flight phase): the previous cost function
+    # is corrected by their difference, no breakpoints have to be merged
+    elif all(previous_component.breakpoints.size == 0 and component.breakpoints.size == 0
+             for previous_component, component in changed_components):
+        cost_function = get_sum_cost_function(
+            [cost_object.cost_function, *(component for _, component in changed_components),
+             *(previous_component * -1. for previous_component, _ in changed_components)])
+    else:
+        cost_function = get_total_cost_function(cost_object.total_crew_costs_function, total_maintenance_costs,
+                                                curfew_costs, passengers_hard_costs, passengers_soft_costs,
+                                                missed_connection_costs)
+
+    return CostObject(cost_function, cost_object.aircraft_type, flight_phase_input,
+                      cost_object.is_low_cost_airline, cost_object.flight_length, cost_object.origin_airport,
+                      cost_object.destination_airport, cost_object.curfew_violated,
+                      cost_object.curfew_costs_exact_value, cost_object.crew_costs, cost_object.maintenance_costs,
+                      cost_object.fuel_costs, missed_connection_passengers, cost_object.curfew,
+                      aircraft_cluster, flight_phase, haul, scenario, passenger_scenario, passengers_number,
+                      cost_object.total_crew_costs_function, total_maintenance_costs,
+                      cost_object.total_fuel_costs_function, curfew_costs, passengers_hard_costs,
+                      passengers_soft_costs, cost_object.airline, missed_connection_costs=missed_connection_costs,
+                      passengers=passengers)
 
 
 def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NECESSARY PARAMETERS
@@ -11,7 +264,8 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
                              maintenance_costs: float | str = None,
                              fuel_costs: float | str = None,
                              missed_connection_passengers: List[Tuple] = None,
-                             curfew: tuple[float, int] | float = None
+                             curfew: tuple[float, int] | float = None,
+                             airline: str = None
                              ) -> CostObject:
     """Generate cost function of delay of a given flight according to the specifics
     Parameters:
@@ -33,7 +287,8 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
             sets all the cost scenarios to low
         flight_length: float=None
             Length of flight in kilometers to calculate the type of haul
-            (actual fuel costs can be calculated only if provided)
+            (actual fuel costs can be calculated only if provided),
+            if None the great circle distance between origin and destination airports is used
         origin_airport: str=None
             ICAO code of airport of departure
         destination_airport: str=None
@@ -72,15 +327,13 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
              the passenger to its final destination
         curfew: Tuple[curfew_time: float, n_passenger: int] or float, default None,
              react_curfew: Union[tuple[float, str], tuple[float, int]] = None
+        airline: str = None
+            airline (ICAO code), its AO_type (LCC, FSC, REG, CHT) sets is_low_cost_airline if this is not provided
 
 
         return: CostObject
         """
 
-    # Zero costs lambda if both scenario and exact value are None
-    def zero_costs():
-        return lambda delay: 0
-
     # DEFAULT
     haul = "MediumHaul"
     scenario = "base"
@@ -94,15 +347,8 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
     curfew_costs = zero_costs()
     passengers_hard_costs = zero_costs()
     passengers_soft_costs = zero_costs()
-
-    class FunctionInputParametersError(Exception):
-        def __init__(self, conflict_type: str):
-            self.conflict_type = conflict_type
-            self.message = ("Conflict between exact value and scenario for: " + self.conflict_type
-                            + " Cannot both be non None")
-
-        def __repr__(self):
-            return "Conflict between exact value and scenario for: " + self.conflict_type + " Cannot both be non None"
+    missed_connection_costs = zero_costs()
+    cost_function = zero_costs()
 
     try:
         aircraft_cluster = get_aircraft_cluster(aircraft_type)
@@ -117,6 +363,12 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
 
         if flight_length is not None:
             haul = get_haul(flight_length)
+        # without flight length the great circle distance between origin and destination airports is used
+        elif origin_airport is not None and destination_airport is not None:
+            great_circle_distance = get_flight_length(origin_airport.strip().upper(),
+                                                      destination_airport.strip().upper())
+            if great_circle_distance > 0:
+                haul = get_haul(great_circle_distance)
 
         if (origin_airport is not None) and (is_valid_airport_icao(airport_icao=origin_airport.strip().upper())):
             origin_airport = origin_airport
@@ -125,6 +377,12 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
                 is_valid_airport_icao(airport_icao=destination_airport.strip().upper())):
             destination_airport = destination_airport
 
+        # Airline resolved through the airline index, is_low_cost_airline if provided takes precedence
+        if airline is not None:
+            airline_record = get_airline(airline.strip().upper())
+            if is_low_cost_airline is None:
+                is_low_cost_airline = airline_record.ao_type == "LCC"
+
             # If airline is LCC sets all costs scenario to low,
             # elif destination airport is in group 1 airports (more than 25 million passengers) set scenario to high
             # else scenario default is base
@@ -135,105 +393,34 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
 
         # without passengers number input inserted use passengers load factor based on scenario either inserted by user
         # or indirectly obtained by previous if statement
-        if passengers is not None and type(passengers) is str:
-            passenger_scenario = passengers
+        if passengers is None or type(passengers) is str:
+            passenger_scenario = passenger_scenario if passengers is None else passengers
             passengers_number = get_passengers(aircraft_type=aircraft_cluster, scenario=passenger_scenario)
 
         number_missed_connection_passengers = 0 if missed_connection_passengers is None else len(
             missed_connection_passengers)
 
         if passengers is not None and type(passengers) is int:
-            passengers_number = passengers_number - number_missed_connection_passengers
-
-        # CREW COSTS
-        # NO crew costs input, either manage as zero costs or choose a default scenario
-        if crew_costs is None:
-            # total_crew_costs = zero_costs()
-            total_crew_costs = get_crew_costs(aircraft_cluster=aircraft_cluster, scenario=scenario)
-        # Crew costs based on exact value
-        elif type(crew_costs) is float:
-            total_crew_costs = get_crew_costs_from_exact_value(crew_costs)
-        # Crew cost estimation based on scenario
-        elif type(crew_costs) is str:
-            total_crew_costs = get_crew_costs(aircraft_cluster=aircraft_cluster, scenario=crew_costs)
-        else:
-            raise FunctionInputParametersError("CREW")
-
-        # MAINTENANCE COSTS
-        # NO maintenance costs input,  either manage as zero costs or choose a default scenario
-        if maintenance_costs is None:
-            # total_maintenance_costs = zero_costs()
-            total_maintenance_costs = get_maintenance_costs(aircraft_cluster=aircraft_cluster,
-                                                            scenario=scenario, flight_phase=flight_phase)
-        # Maintenance costs based on exact value
-        elif type(maintenance_costs) is float:
-            total_maintenance_costs = get_maintenance_costs_from_exact_value(maintenance_costs)
-        # Maintenance costs based on scenario
-        elif type(maintenance_costs) is str:
-            total_maintenance_costs = get_maintenance_costs(aircraft_cluster=aircraft_cluster,
-                                                            scenario=maintenance_costs, flight_phase=flight_phase)
-        else:
-            raise FunctionInputParametersError("MAINTENANCE")
-
-        # FUEL COSTS
-        # No fuel costs input,  either manage as zero costs or choose a default scenario
-        if fuel_costs is None:
-            total_fuel_costs = zero_costs()
-            # total_fuel_costs = get_fuel_costs(aircraft_cluster=aircraft_cluster, scenario=scenario,
-            # flight_phase=flight_phase)
-        # Fuel costs based on exact value
-        elif type(fuel_costs) is float:
-            total_fuel_costs = get_fuel_costs_from_exact_value(fuel_costs)
-        # Fuel costs based on scenario
-        # elif type(fuel_costs) is str:
-        #     total_fuel_costs = get_fuel_costs(aircraft_cluster=aircraft_cluster,
-        #                                 scenario=fuel_costs, flight_phase=flight_phase)
-        else:
-            raise FunctionInputParametersError("FUEL")
-
-        # CURFEW COSTS
-        # Curfew not violated and no curfew costs provided
-        if curfew_violated is False and curfew_costs_exact_value is None:
-            curfew_costs = zero_costs()
-        # Curfew costs base on exact value
-        elif curfew_costs_exact_value is not None and curfew_violated is True:
-            curfew_costs = get_curfew_costs_from_exact_value(curfew_costs_exact_value)
-        elif curfew_violated is True and curfew is None:
-            curfew_costs = zero_costs()
-        elif curfew_violated is True and curfew is not None:
-            curfew_threshold = curfew[0] if curfew is tuple else curfew
-            curfew_passengers = curfew[
-                1] if curfew is tuple else passengers_number + number_missed_connection_passengers
-            curfew_costs = get_curfew_costs(aircraft_cluster=aircraft_cluster, curfew_passengers=curfew_passengers)
-        else:  # Both parameters are not None, situation managed as a conflict
-            raise FunctionInputParametersError("CURFEW")
-
-        # PASSENGER COSTS
-        # Soft and Hard costs of passengers who didn't lose the connection
-        passengers_hard_costs = get_hard_costs(passengers=passengers_number, scenario=passenger_scenario, haul=haul)
-        passengers_soft_costs = get_soft_costs(passengers=passengers_number, scenario=passenger_scenario)
-
-        # Soft and Hard costs of passengers with missed connection
-        if number_missed_connection_passengers > 0:
-            # Hard and soft costs for a single passenger
-            missed_connection_passengers_hard_costs = get_hard_costs(passengers=1, scenario=passenger_scenario,
-                                                                     haul=haul)
-            missed_connection_passengers_soft_costs = get_soft_costs(passengers=1, scenario=passenger_scenario)
-
-            def considered_passenger_costs(delay, passenger, cost_type):
-                # Set only care if delay is less than passenger connection threshold
-                # Set 0 if delay < passenger connection threshold
-                considered_passengers_cost_function = missed_connection_passengers_hard_costs if cost_type == 'hard' \
-                    else missed_connection_passengers_soft_costs
-                return considered_passengers_cost_function(delay if delay < passenger[0] else passenger[1])
-
-            passengers_costs = lambda delay: passengers_hard_costs(delay) + passengers_soft_costs(delay) + sum(
-                considered_passenger_costs(delay, passenger, 'hard') for passenger in
-                missed_connection_passengers) + sum(
-                considered_passenger_costs(delay, passenger, 'soft') for passenger in
-                missed_connection_passengers)
-        else:
-            passengers_costs = lambda delay: passengers_hard_costs(delay) + passengers_soft_costs(delay)
+            passengers_number = passengers - number_missed_connection_passengers
+
+        # Inputs fully determining the components: flights sharing them share the cached component functions.
+        # Types are part of the key since exact values and scenarios are told apart by type
+        cost_components_key = (aircraft_cluster, flight_phase, haul, scenario, passenger_scenario, passengers_number,
+                               *((type(value), value) for value in (crew_costs, maintenance_costs, fuel_costs,
+                                                                     curfew_violated, curfew_costs_exact_value,
+                                                                     curfew)),
+                               None if missed_connection_passengers is None else tuple(
+                                   tuple(passenger) for passenger in missed_connection_passengers))
+
+        (total_crew_costs, total_maintenance_costs, total_fuel_costs, curfew_costs,
+         passengers_hard_costs, passengers_soft_costs, missed_connection_costs,
+         cost_function) = get_cached_cost_components(
+            cost_components_key, lambda: get_cost_components(
+                aircraft_cluster=aircraft_cluster, flight_phase=flight_phase, haul=haul, scenario=scenario,
+                passenger_scenario=passenger_scenario, passengers_number=passengers_number, crew_costs=crew_costs,
+                maintenance_costs=maintenance_costs, fuel_costs=fuel_costs, curfew_violated=curfew_violated,
+                curfew_costs_exact_value=curfew_costs_exact_value, curfew=curfew,
+                missed_connection_passengers=missed_connection_passengers))
 
     except AircraftClusterError as aircraft_cluster_error:
         print(aircraft_cluster_error.message)
@@ -244,6 +431,9 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
     except AirportCodeError as airport_code_error:
         print(airport_code_error.message)
 
+    except AirlineCodeError as airline_code_error:
+        print(airline_code_error.message)
+
     except HaulError as haul_error:
         print(haul_error.message)
 
@@ -269,12 +459,9 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
         print(function_input_parameters_conflict_error.message)
 
     except Exception as e:
-        print(print(f"An unexpected exception occurred: {e}"))
+        print(f"An unexpected exception occurred: {e}")
 
     finally:
-        cost_function = lambda delay: (total_maintenance_costs(delay) + total_crew_costs(delay)
-                                       + passengers_costs(delay) + curfew_costs(delay))
-
         # Dictionary to store both the function and the input parameters
 
         cost_object = CostObject(cost_function, aircraft_type, flight_phase_input,
@@ -284,6 +471,7 @@ def get_tactical_delay_costs(aircraft_type: str, flight_phase_input: str,  # NEC
                                  aircraft_cluster, flight_phase, haul,
                                  scenario, passenger_scenario, passengers_number, total_crew_costs,
                                  total_maintenance_costs, total_fuel_costs, curfew_costs,
-                                 passengers_hard_costs, passengers_soft_costs)
+                                 passengers_hard_costs, passengers_soft_costs, airline,
+                                 missed_connection_costs=missed_connection_costs, passengers=passengers)
 
         return cost_object
@@ -0,0 +1,196 @@
+import argparse
+import ast
+import os
+import sys
+from typing import Iterable, Iterator
+import numpy as np
+import pandas as pd
+
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, \
+    evaluate_batch_cost_components, COST_COMPONENTS
+from CostPackage.TacticalDelayCosts.parallel_tactical_delay_costs import get_chunks_costs
+
+# Input columns holding either exact values (numbers) or scenarios (strings)
+EXACT_VALUE_OR_SCENARIO_COLUMNS = ["passengers", "crew_costs", "maintenance_costs", "fuel_costs"]
+
+# Input columns holding codes and names
+TEXT_COLUMNS = ["aircraft_type", "flight_phase_input", "origin_airport", "destination_airport", "airline"]
+
+# Input columns holding tuples, written as Python literals in csv files e.g. [(60, 200), (120, 300)]
+TUPLE_COLUMNS = ["missed_connection_passengers", "curfew"]
+
+BOOLEAN_COLUMNS = ["is_low_cost_airline", "curfew_violated"]
+
+FLOAT_COLUMNS = ["flight_length", "curfew_costs_exact_value"]
+
+# Columns of the cost coefficients which are input values, not written to the output
+COEFFICIENTS_INPUT_COLUMNS = ["missed_connection_passengers"]
+
+FILE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".jsonl": "jsonl", ".json": "jsonl"}
+
+
+# File format from the option or the file extension
+def get_file_format(path: str, file_format: str = None) -> str:
+    if file_format is not None:
+        return file_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError("Cannot guess the format of " + path + ", use csv, parquet or jsonl")
+    return FILE_FORMATS[extension]
+
+
+# Delays as a comma separated list of delays or start:stop:step ranges (stop included) e.g. 0,5,10:120:10
+def parse_delays(text: str) -> np.ndarray:
+    delays = []
+    for item in text.split(","):
+        if ":" in item:
+            start, stop, step = (float(value) for value in item.split(":"))
+            delays.extend(start + step * np.arange(int(np.floor((stop - start) / step + 1e-9)) + 1))
+        else:
+            delays.append(float(item))
+    return np.array(delays, dtype=float)
+
+
+# Chunks of chunk_size flights read from the file, the whole file is never loaded in memory
+def read_flight_chunks(path: str, file_format: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    # text, mixed types and tuple columns are read as strings, so that they have the same type in all the chunks
+    # even if they are empty in some of them (e.g. no destination airport in the first chunk)
+    dtype = {**{column: str for column in TEXT_COLUMNS + EXACT_VALUE_OR_SCENARIO_COLUMNS + TUPLE_COLUMNS
+                + BOOLEAN_COLUMNS},
+             **{column: float for column in FLOAT_COLUMNS}}
+    if file_format == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=dtype, skipinitialspace=True)
+    elif file_format == "jsonl":
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size, dtype=dtype)
+    else:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+# Values read as strings from text files converted to the types expected by get_tactical_delay_costs
+def get_exact_value_or_scenario(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def get_tuple(value):
+    return ast.literal_eval(value) if isinstance(value, str) else value
+
+
+def get_boolean(value):
+    if not isinstance(value, str):
+        return value
+    return {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False}.get(
+        value.strip().lower(), None)
+
+
+def get_flights(chunk: pd.DataFrame) -> pd.DataFrame:
+    flights = chunk.copy()
+    for columns, get_value in [(EXACT_VALUE_OR_SCENARIO_COLUMNS, get_exact_value_or_scenario),
+                               (TUPLE_COLUMNS, get_tuple), (BOOLEAN_COLUMNS, get_boolean)]:
+        for column in set(columns).intersection(flights.columns):
+            flights[column] = flights[column].astype(object).map(get_value, na_action="ignore")
+    return flights
+
+
+# Output rows of one chunk: the kept input columns followed by the costs at each delay (cost_<delay>),
+# the costs of each component at each delay (<component>_<delay>) if breakdown,
+# or the cost coefficients of each flight if no delays are provided
+def get_chunk_results(chunk: pd.DataFrame, delays: np.ndarray = None, breakdown: bool = False,
+                      keep_columns: list = None) -> pd.DataFrame:
+    coefficients = get_batch_cost_coefficients(get_flights(chunk))
+    kept = chunk[chunk.columns if keep_columns is None else keep_columns]
+    if delays is None:
+        # the resolved values (e.g. crew_costs in EUR/min) replace the input ones (e.g. crew_costs scenario)
+        results = coefficients.drop(columns=COEFFICIENTS_INPUT_COLUMNS)
+        kept = kept.drop(columns=[column for column in kept.columns if column in results.columns])
+    else:
+        components = evaluate_batch_cost_components(coefficients, delays)
+        columns = {}
+        for index, delay in enumerate(delays):
+            columns["cost_" + format(delay, "g")] = sum(components[component][:, index]
+                                                        for component in COST_COMPONENTS)
+            if breakdown:
+                for component in COST_COMPONENTS:
+                    columns[component + "_" + format(delay, "g")] = components[component][:, index]
+        results = pd.DataFrame(columns, index=chunk.index)
+    return pd.concat([kept, results], axis=1).reset_index(drop=True)
+
+
+# Write the chunks of results one after the other, only one chunk is in memory at a time
+def write_chunks(results: Iterable[pd.DataFrame], path: str, file_format: str) -> int:
+    rows = 0
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk_results in results:
+                table = pa.Table.from_pandas(chunk_results, preserve_index=False,
+                                             schema=None if writer is None else writer.schema)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk_results)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        for chunk_results in results:
+            if file_format == "csv":
+                chunk_results.to_csv(file, header=rows == 0, index=False)
+            else:
+                lines = chunk_results.to_json(orient="records", lines=True).rstrip("\n")
+                file.write(lines + "\n" if lines else "")
+            rows += len(chunk_results)
+    return rows
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="delaycost",
+        description="Tactical delay costs of the flights of a csv, parquet or json lines file. "
+                    "Columns are named as the parameters of get_tactical_delay_costs, the file is read and costed "
+                    "in chunks so that memory use does not depend on its size.")
+    parser.add_argument("input", help="flights file (.csv, .parquet, .jsonl)")
+    parser.add_argument("output", help="results file (.csv, .parquet, .jsonl)")
+    parser.add_argument("-d", "--delays", type=parse_delays,
+                        help="delays in minutes, e.g. 0,15,30 or 0:600:15 (stop included). "
+                             "Without delays the cost coefficients of each flight are written")
+    parser.add_argument("-b", "--breakdown", action="store_true",
+                        help="also write crew, maintenance, hard, soft, curfew and missed connection costs")
+    parser.add_argument("-k", "--keep", type=lambda text: text.split(","),
+                        help="comma separated input columns copied to the output, all of them by default")
+    parser.add_argument("-c", "--chunk-size", type=int, default=100000, help="flights per chunk (default 100000)")
+    parser.add_argument("-p", "--processes", type=int, default=1,
+                        help="worker processes costing the chunks (default 1)")
+    parser.add_argument("--input-format", choices=["csv", "parquet", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "parquet", "jsonl"])
+    return parser
+
+
+# delaycost console entry point
+def main(argv: list = None) -> int:
+    arguments = get_parser().parse_args(argv)
+    try:
+        chunks = read_flight_chunks(arguments.input, get_file_format(arguments.input, arguments.input_format),
+                                    arguments.chunk_size)
+        results = get_chunks_costs(((chunk, arguments.delays, arguments.breakdown, arguments.keep)
+                                    for chunk in chunks), processes=arguments.processes,
+                                   chunk_function=get_chunk_results)
+        rows = write_chunks(results, arguments.output, get_file_format(arguments.output, arguments.output_format))
+    except Exception as error:
+        print("delaycost: " + str(getattr(error, "message", error)), file=sys.stderr)
+        return 1
+    print("delaycost: " + str(rows) + " flights written to " + arguments.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
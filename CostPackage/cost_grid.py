@@ -0,0 +1,122 @@
+from typing import Iterable
+import numpy as np
+
+
+class CostGrid:
+    def __init__(self, costs, start: float, resolution: float, jumps=None):
+        """Costs of delay tabulated on a regular grid of delays
+
+        costs: np.ndarray
+            costs in EUR at the grid delays, shape (grid size,) for one flight
+            or (number of flights, grid size) for many flights stacked together
+
+        start: float
+            first delay of the grid in minutes
+
+        resolution: float
+            minutes between two consecutive delays of the grid
+
+        jumps: array-like | list[array-like] = None
+            delays in minutes where the cost function jumps (get_breakpoints(jumps_only=True) of the cost object),
+            one array for each flight of a stacked grid. Without them the costs are interpolated across the jumps
+
+        delays: np.ndarray
+            delays of the grid in minutes
+
+        Calls are answered in constant time: exact lookup at the grid delays, linear interpolation between them
+        (or the cost at the grid delay at or before the delay if interpolate is False),
+        delays outside the grid are clamped to its first or last delay.
+        Between two grid delays with a jump of the cost function (hard costs, missed connection and curfew
+        thresholds) there is no interpolation: the cost at the grid delay before the jump is taken for
+        the delays before it, the cost at the grid delay after it from the jump on
+        """
+        self.costs = np.ascontiguousarray(costs, dtype=float)
+        self.start = float(start)
+        self.resolution = float(resolution)
+        if self.costs.shape[-1] < 2:
+            raise ValueError("A cost grid needs at least two delays")
+        self.delays = self.start + self.resolution * np.arange(self.costs.shape[-1])
+        self.jumps = None if jumps is None else self.get_cell_jumps(jumps)
+
+    # First jump of the cost function in each cell (grid delay, next grid delay], nan in the cells without jumps
+    def get_cell_jumps(self, jumps) -> np.ndarray:
+        jumps = [jumps] if self.costs.ndim == 1 else list(jumps)
+        if len(jumps) != len(self.costs.reshape(-1, self.delays.size)):
+            raise ValueError("One array of jumps is needed for each flight of the cost grid, got " + str(len(jumps)))
+        cell_jumps = np.full((len(jumps), self.delays.size - 1), np.inf)
+        for row, flight_jumps in enumerate(jumps):
+            flight_jumps = np.asarray(flight_jumps, dtype=float).reshape(-1)
+            flight_jumps = flight_jumps[(flight_jumps > self.delays[0]) & (flight_jumps <= self.delays[-1])]
+            cells = np.searchsorted(self.delays, flight_jumps, side="left") - 1
+            np.minimum.at(cell_jumps[row], cells, flight_jumps)
+        cell_jumps[np.isinf(cell_jumps)] = np.nan
+        return cell_jumps.reshape(self.costs.shape[:-1] + (self.delays.size - 1,))
+
+    def __call__(self, delay, flight=None, interpolate: bool = True):
+        """Costs at the given delays
+
+        delay: float | np.ndarray
+            delays expressed in minutes
+
+        flight: int | np.ndarray = None
+            index of the flights of a stacked grid, broadcast together with delay,
+            all the flights when None (one row of costs for each flight)
+
+        interpolate: bool = True
+            linear interpolation between grid delays (except across the jumps of the cost function),
+            if False the cost at the grid delay at or before the delay
+
+        return: float | np.ndarray
+            costs in EUR
+        """
+        last = self.delays.size - 1
+        # scalar delays (optimizer inner loops) are answered without numpy array operations
+        if isinstance(delay, (int, float)) and (flight is None or isinstance(flight, (int, np.integer))):
+            position = min(max((delay - self.start) / self.resolution, 0.), last)
+            index = min(int(position), last - 1)
+            costs = self.costs if flight is None else self.costs[flight]
+            lower, upper = (costs[index], costs[index + 1]) if costs.ndim == 1 else (costs[:, index],
+                                                                                     costs[:, index + 1])
+            if not interpolate:
+                return upper if position >= index + 1 else lower
+            weight = position - index
+            interpolated = lower * (1 - weight) + upper * weight
+            if self.jumps is None:
+                return interpolated
+            jumps = self.jumps if flight is None else self.jumps[flight]
+            jump = jumps[index] if jumps.ndim == 1 else jumps[:, index]
+            if costs.ndim == 1:
+                return interpolated if jump != jump else (upper if min(delay, self.delays[-1]) >= jump else lower)
+            return np.where(np.isnan(jump), interpolated, np.where(min(delay, self.delays[-1]) >= jump, upper, lower))
+
+        delay = np.asarray(delay, dtype=float)
+        position = np.clip((delay - self.start) / self.resolution, 0, last)
+        index = np.minimum(position.astype(np.intp), last - 1)
+        lower, upper = ((self.costs[..., index], self.costs[..., index + 1]) if flight is None
+                        else (self.costs[flight, index], self.costs[flight, index + 1]))
+        if not interpolate:
+            return np.where(position >= index + 1, upper, lower)[()]
+        weight = position - index
+        interpolated = lower * (1 - weight) + upper * weight
+        if self.jumps is None:
+            return interpolated[()]
+        jump = self.jumps[..., index] if flight is None else self.jumps[flight, index]
+        return np.where(np.isnan(jump), interpolated,
+                        np.where(np.minimum(delay, self.delays[-1]) >= jump, upper, lower))[()]
+
+
+# Number of delays of a grid from start to stop (included) with the given resolution
+def get_grid_size(start: float, stop: float, resolution: float) -> int:
+    if resolution <= 0 or stop <= start:
+        raise ValueError("Cost grid needs resolution > 0 and stop > start, got start " + str(start)
+                         + " stop " + str(stop) + " resolution " + str(resolution))
+    return int(np.floor((stop - start) / resolution + 1e-9)) + 1
+
+
+# Cost grids of many cost objects stacked into one 2-D array, one row for each flight
+def get_cost_grid(cost_objects: Iterable, start: float = 0, stop: float = 720, resolution: float = 1) -> CostGrid:
+    delays = start + resolution * np.arange(get_grid_size(start, stop, resolution))
+    cost_objects = list(cost_objects)
+    costs = np.array([cost_object.evaluate(delays) for cost_object in cost_objects]).reshape(-1, delays.size)
+    return CostGrid(costs, start, resolution,
+                    jumps=[cost_object.get_breakpoints(jumps_only=True) for cost_object in cost_objects])
@@ -1,14 +1,46 @@
+import functools
+import json
+import numpy as np
+
+from CostPackage.cost_grid import CostGrid, get_grid_size
+from CostPackage.piecewise_cost_function import get_cost_function_from_dict, get_constant_cost_function
+
+# Cost functions of a cost object with the name of the matching constructor parameter
+COST_FUNCTIONS = {
+    "cost_function": "cost_function",
+    "total_crew_costs_function": "total_crew_costs",
+    "total_maintenance_costs_function": "total_maintenance_costs",
+    "total_fuel_costs_function": "total_fuel_costs",
+    "curfew_costs_function": "curfew_costs",
+    "passengers_hard_costs_function": "passengers_hard_costs",
+    "passengers_soft_costs_function": "passengers_soft_costs",
+    "missed_connection_costs_function": "missed_connection_costs"
+}
+
+# Derived parameters of a cost object with the name of the matching constructor parameter
+DERIVED_PARAMETERS = {
+    "aircraft_cluster": "aircraft_cluster",
+    "flight_phase": "flight_phase",
+    "haul_type": "haul",
+    "final_cost_scenario": "scenario",
+    "final_passenger_scenario": "passenger_scenario",
+    "adjusted_passengers_number": "passengers_number"
+}
+
+
 class CostObject:
     def __init__(self, cost_function, aircraft_type, flight_phase_input,
                  is_low_cost_airline, flight_length, origin_airport, destination_airport, curfew_violated,
                  curfew_costs_exact_value, crew_costs, maintenance_costs, fuel_costs, missed_connection_passengers,
                  curfew, aircraft_cluster, flight_phase, haul, scenario, passenger_scenario, passengers_number,
                  total_crew_costs, total_maintenance_costs, total_fuel_costs, curfew_costs,
-                 passengers_hard_costs, passengers_soft_costs):
+                 passengers_hard_costs, passengers_soft_costs, airline=None, missed_connection_costs=None,
+                 passengers=None):
         """Object containing the result of the cost function computation
 
-        cost_function: lambda
-            the lambda function which take as input the delay and returns the cost
+        cost_function: PiecewiseCostFunction
+            callable which takes as input the delay and returns the cost,
+            breakpoints and polynomial coefficients of each segment are available
 
         params_dict: dict
             the dictionary containing all parameters of the cost object
@@ -18,12 +50,34 @@ class CostObject:
 
         info():
             methods that prints all parameters of the cost object
+
+        evaluate(delays) -> np.ndarray:
+            vectorized evaluation of the cost function over an array of delays
+
+        get_cost_grid(start, stop, resolution) -> CostGrid:
+            cost function tabulated on a regular grid of delays for constant time lookups
+
+        get_marginal_cost(delays):
+            marginal cost d(cost)/d(delay) in EUR/min at a delay or over an array of delays
+
+        get_breakpoints(jumps_only) -> np.ndarray:
+            delays where the cost function changes or jumps
+
+        with_passengers(passengers), with_phase(flight_phase_input), with_missed_connections(passengers),
+        add_missed_connections(passengers), remove_missed_connections(passengers) -> CostObject:
+            cost object with updated inputs, only the cost functions depending on them are built again
+
+        to_dict() -> dict, to_json() -> str:
+            data-only representation (parameters, breakpoints and coefficients of the cost functions),
+            loaded back with get_cost_object_from_dict and get_cost_object_from_json.
+            Cost objects are pickled in the same form, the cost functions are rebuilt on first use after loading
         """
 
         self.cost_function = cost_function
 
         self.aircraft_type = aircraft_type
         self.flight_phase_input = flight_phase_input
+        self.passengers = passengers
         self.passengers_number = passengers_number
         self.passenger_scenario = passenger_scenario
         self.is_low_cost_airline = is_low_cost_airline
@@ -37,6 +91,7 @@ class CostObject:
         self.fuel_costs = fuel_costs
         self.missed_connection_passengers = missed_connection_passengers
         self.curfew = curfew
+        self.airline = airline
         self.aircraft_cluster = aircraft_cluster
         self.flight_phase = flight_phase
         self.haul_type = haul
@@ -49,6 +104,8 @@ class CostObject:
         self.curfew_costs_function = curfew_costs
         self.passengers_hard_costs_function = passengers_hard_costs
         self.passengers_soft_costs_function = passengers_soft_costs
+        self.missed_connection_costs_function = (get_constant_cost_function(0.) if missed_connection_costs is None
+                                                 else missed_connection_costs)
 
         self.params_dict = self.make_params_dict()
 
@@ -58,6 +115,7 @@ class CostObject:
             "parameters": {
                 "aircraft_type": self.aircraft_type,
                 "flight_phase_input": self.flight_phase_input,
+                "passengers": self.passengers,
                 "passengers_number": self.passengers_number,
                 "passenger_scenario": self.passenger_scenario,
                 "is_low_cost_airline": self.is_low_cost_airline,
@@ -70,7 +128,8 @@ class CostObject:
                 "maintenance_costs": self.maintenance_costs,
                 "fuel_costs": self.fuel_costs,
                 "missed_connection_passengers": self.missed_connection_passengers,
-                "curfew": self.curfew
+                "curfew": self.curfew,
+                "airline": self.airline
             },
             "derived_parameters": {
                 "aircraft_cluster": self.aircraft_cluster,
@@ -84,10 +143,141 @@ class CostObject:
                 "total_fuel_costs_function": self.total_fuel_costs_function,
                 "curfew_costs_function": self.curfew_costs_function,
                 "passengers_hard_costs_function": self.passengers_hard_costs_function,
-                "passengers_soft_costs_function": self.passengers_soft_costs_function
+                "passengers_soft_costs_function": self.passengers_soft_costs_function,
+                "missed_connection_costs_function": self.missed_connection_costs_function
             }
         }
 
+    # Cost functions and params_dict of a loaded cost object, rebuilt from its data on first use
+    def __getattr__(self, name):
+        function_data = self.__dict__.get("function_data")
+        if function_data is None:
+            raise AttributeError(name)
+        if name in COST_FUNCTIONS:
+            value = get_cost_function_from_dict(function_data.pop(name))
+        elif name == "params_dict":
+            value = self.make_params_dict()
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def __reduce__(self):
+        return get_cost_object_from_dict, (self.to_dict(),)
+
+    def to_dict(self) -> dict:
+        """Data-only representation of the cost object: input and derived parameters,
+        breakpoints and coefficients of the cost functions. Only lists, numbers, strings, booleans and None
+
+        return: dict
+            with keys "parameters", "derived_parameters" and "functions"
+        """
+        function_data = self.__dict__.get("function_data", {})
+        return {
+            "parameters": {name: get_data_value(value)
+                           for name, value in self.make_params_dict()["parameters"].items()},
+            "derived_parameters": {name: get_data_value(getattr(self, name)) for name in DERIVED_PARAMETERS},
+            "functions": {name: function_data[name] if name in function_data else getattr(self, name).to_dict()
+                          for name in COST_FUNCTIONS}
+        }
+
+    # Compact JSON form of to_dict
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    # Incremental updates, see get_updated_cost_object
+    def with_passengers(self, passengers: int | str):
+        from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_updated_cost_object
+        return get_updated_cost_object(self, passengers=passengers)
+
+    def with_phase(self, flight_phase_input: str):
+        from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_updated_cost_object
+        return get_updated_cost_object(self, flight_phase_input=flight_phase_input)
+
+    def with_missed_connections(self, missed_connection_passengers: list):
+        from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_updated_cost_object
+        return get_updated_cost_object(self, missed_connection_passengers=missed_connection_passengers)
+
+    def add_missed_connections(self, missed_connection_passengers: list):
+        return self.with_missed_connections(list(self.missed_connection_passengers or [])
+                                            + list(missed_connection_passengers))
+
+    # Each tuple removes one passenger with the same delay threshold and delay perceived
+    def remove_missed_connections(self, missed_connection_passengers: list):
+        remaining = list(self.missed_connection_passengers or [])
+        for passenger in missed_connection_passengers:
+            matching = [index for index, remaining_passenger in enumerate(remaining)
+                        if tuple(remaining_passenger) == tuple(passenger)]
+            if not matching:
+                raise ValueError("Missed connection passenger " + str(passenger) + " not found")
+            del remaining[matching[0]]
+        return self.with_missed_connections(remaining)
+
+    def evaluate(self, delays) -> np.ndarray:
+        """Evaluate the cost function over an array of delays in one call
+
+        delays: array-like
+            delays expressed in minutes
+
+        return: np.ndarray
+            costs in EUR with the same shape of delays
+        """
+        delays = np.asarray(delays, dtype=float)
+        return np.zeros(delays.shape) + self.cost_function(delays)
+
+    # Derivative of the cost function, built on first use
+    @functools.cached_property
+    def marginal_cost_function(self):
+        return self.cost_function.derivative()
+
+    def get_marginal_cost(self, delays):
+        """Marginal cost d(cost)/d(delay) of the cost function
+
+        delays: float | array-like
+            delays expressed in minutes
+
+        return: float | np.ndarray
+            marginal costs in EUR/min, at a breakpoint the marginal cost from the breakpoint on
+            (the jumps of the cost function are listed by get_breakpoints)
+        """
+        return self.marginal_cost_function(delays)
+
+    def get_breakpoints(self, jumps_only: bool = False) -> np.ndarray:
+        """Delays where the cost function changes: hard costs thresholds, soft costs interpolation nodes,
+        missed connection thresholds and curfew threshold. Between two breakpoints the cost function is a polynomial
+
+        jumps_only: bool = False
+            only the delays where the cost function jumps (e.g. hard costs, missed connection and curfew thresholds),
+            not the ones where only the marginal cost changes (e.g. soft costs interpolation nodes)
+
+        return: np.ndarray
+            sorted delays in minutes
+        """
+        cost_function = self.cost_function.simplified()
+        if not jumps_only:
+            return cost_function.breakpoints
+        # soft costs are continuous, up to rounding errors
+        tolerance = 1e-9 * np.maximum(1, np.abs(cost_function(cost_function.breakpoints)))
+        return cost_function.breakpoints[np.abs(cost_function.get_jumps()) > tolerance]
+
+    def get_cost_grid(self, start: float = 0, stop: float = 720, resolution: float = 1) -> CostGrid:
+        """Tabulate the cost function on a regular grid of delays, calls to the grid are constant time lookups,
+        not interpolated across the jumps of the cost function
+
+        start: float = 0
+            first delay of the grid in minutes
+
+        stop: float = 720
+            last delay of the grid in minutes (included)
+
+        resolution: float = 1
+            minutes between two consecutive delays of the grid
+
+        return: CostGrid
+        """
+        delays = start + resolution * np.arange(get_grid_size(start, stop, resolution))
+        return CostGrid(self.evaluate(delays), start, resolution, jumps=self.get_breakpoints(jumps_only=True))
+
     def get_params(self):
 
         key_list = list(self.params_dict.keys())
@@ -138,3 +328,40 @@ class CostObject:
         # l = list(list(self.params_dict.keys())[2].keys())
         # for key in l:
         #     print(key)
+
+
+# Numpy values converted to Python ones and tuples to lists, as in JSON
+def get_data_value(value):
+    if isinstance(value, (tuple, list, np.ndarray)):
+        return [get_data_value(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def get_cost_object_from_dict(data: dict) -> CostObject:
+    """Cost object from its data-only representation (CostObject.to_dict),
+    the cost functions are rebuilt from their breakpoints and coefficients on first use
+
+    data: dict
+        with keys "parameters", "derived_parameters" and "functions"
+
+    return: CostObject
+    """
+    parameters = {"airline": None, "passengers": None, **data["parameters"]}
+    # JSON has no tuples
+    if parameters["missed_connection_passengers"] is not None:
+        parameters["missed_connection_passengers"] = [tuple(missed_connection) for missed_connection
+                                                      in parameters["missed_connection_passengers"]]
+    if isinstance(parameters["curfew"], list):
+        parameters["curfew"] = tuple(parameters["curfew"])
+    cost_object = CostObject.__new__(CostObject)
+    cost_object.__dict__.update(parameters)
+    cost_object.__dict__.update(data["derived_parameters"])
+    cost_object.function_data = {"missed_connection_costs_function": get_constant_cost_function(0.).to_dict(),
+                                 **data["functions"]}
+    return cost_object
+
+
+def get_cost_object_from_json(text: str) -> CostObject:
+    return get_cost_object_from_dict(json.loads(text))
@@ -0,0 +1,321 @@
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+from CostPackage.ReferenceData.reference_data import get_reference_cache
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, \
+    evaluate_batch_costs
+from CostPackage.TacticalDelayCosts.cost_cache import CostCache
+
+# Local cost service: one process keeps the reference data and the cost coefficients warm and answers the cost queries
+# of many clients over a unix socket or localhost TCP. Messages are json lines:
+#   request  {"id": 1, "flight": {get_tactical_delay_costs parameters}, "delays": [0, 15, 30]}
+#   response {"id": 1, "costs": [0.0, 410.3, 1180.7]} or {"id": 1, "error": "Aircraft XXXX not found"}
+#   request  {"id": 2, "stats": true} -> response {"id": 2, "stats": {...}}
+# Requests arriving within batch_window seconds are evaluated together with the batch path: the cost coefficients
+# of each distinct flight are resolved once (and kept for the next batches), then the delays of all the requests
+# are evaluated with one vectorized call, outside the event loop
+
+# Number of latencies kept for the percentiles
+LATENCY_WINDOW = 10000
+
+
+class ServiceRequest(NamedTuple):
+    key: str
+    flight: dict
+    delays: np.ndarray
+    future: asyncio.Future
+
+
+# get_tactical_delay_costs parameters from json: json has no tuples
+def get_flight_parameters(flight: dict) -> dict:
+    parameters = dict(flight)
+    if parameters.get("missed_connection_passengers") is not None:
+        parameters["missed_connection_passengers"] = [tuple(missed_connection) for missed_connection
+                                                      in parameters["missed_connection_passengers"]]
+    if isinstance(parameters.get("curfew"), list):
+        parameters["curfew"] = tuple(parameters["curfew"])
+    return parameters
+
+
+# Cost coefficients of the flights as one record per flight, the input errors of the flights are raised
+def get_coefficients_records(flights: list) -> list:
+    coefficients = get_batch_cost_coefficients(pd.DataFrame([get_flight_parameters(flight) for flight in flights]))
+    return coefficients.to_dict("records")
+
+
+class CostService:
+    def __init__(self, batch_window: float = 0.002, max_batch_size: int = 1024, cache_size: int = 4096):
+        """Micro-batching cost service
+
+        batch_window: float = 0.002
+            seconds waited after the first request of a batch for more requests
+
+        max_batch_size: int = 1024
+            maximum number of requests of a batch
+
+        cache_size: int = 4096
+            cost coefficients of the most recent flights kept ready for evaluation
+        """
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.coefficients = CostCache(cache_size)
+        self.queue = None
+        self.batches_task = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.started = time.time()
+
+    async def get_costs(self, flight: dict, delays) -> np.ndarray:
+        """Costs of a flight at the given delays, evaluated with the other requests of the same batch
+
+        flight: dict
+            get_tactical_delay_costs parameters
+
+        delays: array-like
+            delays in minutes
+
+        return: np.ndarray
+            costs in EUR
+        """
+        # the batches are evaluated by run_batches, started with the first request if serve is not running
+        if self.batches_task is None or self.batches_task.done():
+            self.start_batches()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait(ServiceRequest(json.dumps(flight, sort_keys=True), flight,
+                                             np.asarray(delays, dtype=float).reshape(-1), future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    # Queue of the requests and task evaluating their batches, on the running event loop
+    def start_batches(self):
+        self.queue = asyncio.Queue()
+        self.batches_task = asyncio.create_task(self.run_batches())
+
+    # Batches of the requests waiting in the queue, evaluated one after the other in a worker thread
+    # so that the event loop keeps receiving requests meanwhile
+    async def run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            results = await loop.run_in_executor(None, self.evaluate_batch, batch)
+            for request, result in zip(batch, results):
+                if request.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    request.future.set_exception(result)
+                else:
+                    request.future.set_result(result)
+
+    # Cost coefficients records of the flights of a batch, one for each key: the flights not cached are resolved
+    # together, one by one if one of them is invalid so that only its requests fail
+    def get_batch_coefficients(self, flights: dict) -> dict:
+        missing = [key for key in flights if key not in self.coefficients]
+        # cached records are taken before the new ones are stored, which may evict them
+        records = {key: self.coefficients.get(key, None) for key in flights if key not in missing}
+        try:
+            new_records = dict(zip(missing, get_coefficients_records([flights[key] for key in missing])
+                                   if missing else []))
+        except Exception:
+            new_records = {}
+            for key in missing:
+                try:
+                    new_records[key] = get_coefficients_records([flights[key]])[0]
+                except Exception as error:
+                    new_records[key] = error
+        for key, record in new_records.items():
+            records[key] = record if isinstance(record, Exception) else self.coefficients.get(key, lambda: record)
+        return records
+
+    # Costs of the requests of a batch (or the error of their flight): the delays of the requests of each flight are
+    # concatenated, then the delays of all the flights are evaluated with one call of the batch path,
+    # padded to the longest ones
+    def evaluate_batch(self, batch: list) -> list:
+        self.batches += 1
+        groups = {}
+        for index, request in enumerate(batch):
+            groups.setdefault(request.key, []).append(index)
+        records = self.get_batch_coefficients({key: batch[indexes[0]].flight for key, indexes in groups.items()})
+        results = [records[request.key] for request in batch]
+        valid = [key for key in groups if not isinstance(records[key], Exception)]
+        if not valid:
+            return results
+        flight_delays = [np.concatenate([batch[index].delays for index in groups[key]]) for key in valid]
+        delays = np.zeros((len(valid), max(delays.size for delays in flight_delays)))
+        for row, row_delays in enumerate(flight_delays):
+            delays[row, :row_delays.size] = row_delays
+        costs = evaluate_batch_costs(pd.DataFrame.from_records([records[key] for key in valid]), delays)
+        for row, key in enumerate(valid):
+            sizes = [batch[index].delays.size for index in groups[key]]
+            for index, request_costs in zip(groups[key], np.split(costs[row, :sum(sizes)], np.cumsum(sizes)[:-1])):
+                results[index] = request_costs
+        return results
+
+    def get_stats(self) -> dict:
+        latencies = np.array(self.latencies) * 1000
+        percentiles = (np.percentile(latencies, [50, 90, 99]).tolist() if latencies.size
+                       else [None, None, None])
+        coefficients = self.coefficients.info()
+        return {
+            "queue_depth": 0 if self.queue is None else self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else None,
+            "latency_ms": dict(zip(["p50", "p90", "p99"], percentiles)),
+            "coefficients": {"hits": coefficients.hits, "misses": coefficients.misses,
+                             "size": coefficients.currsize},
+            "uptime_s": time.time() - self.started
+        }
+
+    async def answer(self, message: dict) -> dict:
+        if message.get("stats"):
+            return {"id": message.get("id"), "stats": self.get_stats()}
+        start = time.perf_counter()
+        self.requests += 1
+        try:
+            costs = await self.get_costs(message["flight"], message.get("delays", []))
+            response = {"id": message.get("id"), "costs": costs.tolist()}
+        except Exception as error:
+            self.errors += 1
+            response = {"id": message.get("id"), "error": str(getattr(error, "message", error))}
+        self.latencies.append(time.perf_counter() - start)
+        return response
+
+    # One connection, the requests of a client are answered as soon as they are evaluated (not in order)
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def answer_line(line: bytes):
+            try:
+                response = await self.answer(json.loads(line))
+            except (json.JSONDecodeError, AttributeError) as error:
+                response = {"id": None, "error": "Invalid request: " + str(error)}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(answer_line(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self, path: str = None, host: str = "127.0.0.1", port: int = 8765):
+        """Serve cost queries on the unix socket path, or on host:port (localhost by default) if path is None"""
+        # reference data kept warm for all the clients
+        get_reference_cache()
+        get_coefficients_records([{"aircraft_type": "A320", "flight_phase_input": "AT_GATE"}])
+        self.start_batches()
+        server = (await asyncio.start_unix_server(self.handle_connection, path=path) if path is not None
+                  else await asyncio.start_server(self.handle_connection, host=host, port=port))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batches_task.cancel()
+
+
+class CostServiceClient:
+    def __init__(self, path: str = None, host: str = "127.0.0.1", port: int = 8765):
+        """Client of a cost service on the unix socket path, or on host:port if path is None.
+        Many requests can be waiting for their answer at the same time on one connection"""
+        self.path = path
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.pending = {}
+        self.ids = itertools.count()
+        self.responses = None
+
+    async def connect(self):
+        self.reader, self.writer = (await asyncio.open_unix_connection(self.path) if self.path is not None
+                                    else await asyncio.open_connection(self.host, self.port))
+        self.responses = asyncio.create_task(self.read_responses())
+        return self
+
+    async def read_responses(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            future = self.pending.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.pending.values():
+            future.set_exception(ConnectionError("Cost service connection closed"))
+
+    async def request(self, message: dict) -> dict:
+        message = {**message, "id": next(self.ids)}
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message["id"]] = future
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def get_costs(self, flight: dict, delays) -> np.ndarray:
+        response = await self.request({"flight": flight, "delays": np.asarray(delays, dtype=float).tolist()})
+        if "error" in response:
+            raise ValueError(response["error"])
+        return np.array(response["costs"])
+
+    async def get_stats(self) -> dict:
+        return (await self.request({"stats": True}))["stats"]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        if self.responses is not None:
+            self.responses.cancel()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exception):
+        await self.close()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="delaycost-service",
+                                     description="Local cost service answering json lines cost queries")
+    parser.add_argument("-s", "--socket", help="unix socket path, localhost TCP if not provided")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default 127.0.0.1)")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="TCP port (default 8765)")
+    parser.add_argument("-w", "--batch-window", type=float, default=2.,
+                        help="milliseconds waited for more requests after the first of a batch (default 2)")
+    parser.add_argument("-b", "--max-batch-size", type=int, default=1024, help="requests per batch (default 1024)")
+    arguments = parser.parse_args(argv)
+    service = CostService(batch_window=arguments.batch_window / 1000, max_batch_size=arguments.max_batch_size)
+    print("delaycost-service: listening on " + (arguments.socket or arguments.host + ":" + str(arguments.port)))
+    try:
+        asyncio.run(service.serve(arguments.socket, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import inspect
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+from CostPackage.piecewise_cost_function import get_sum_cost_function
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, \
+    evaluate_batch_cost_components, COST_COMPONENTS
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_tactical_delay_costs
+
+# Monte Carlo expected costs of delay: the cost functions jump at the hard costs thresholds (e.g. 180 and 300 minutes)
+# and at the missed connection and curfew thresholds, so the cost at the mean delay is not the expected cost
+
+# Sampled costs held in memory at once, flights are processed in chunks of this many costs
+MAX_CHUNK_COSTS = 2 ** 22
+
+# Scenarios of the scenario_probabilities of get_expected_costs
+SCENARIOS = ["low", "base", "high"]
+
+TACTICAL_DELAY_COSTS_PARAMETERS = set(inspect.signature(get_tactical_delay_costs).parameters)
+
+
+class ExpectedCosts(NamedTuple):
+    mean: np.ndarray
+    variance: np.ndarray
+    quantiles: np.ndarray
+    quantile_levels: np.ndarray
+    cost_at_mean_delay: np.ndarray
+
+
+# Samples of a distribution for the flights of a chunk, shape (flights, samples). The distribution is either
+# a numpy Generator method with its parameters e.g. ("lognormal", 3, .8), parameters can be arrays with one value
+# per flight, a callable(rng, size) returning the samples,
+# empirical samples shared by all flights (1-D) or one row of samples per flight (2-D), drawn with replacement
+def get_samples(distribution, rng: np.random.Generator, flights: slice, number_of_flights: int,
+                samples: int) -> np.ndarray:
+    size = (number_of_flights, samples)
+    if callable(distribution):
+        return np.broadcast_to(distribution(rng, size), size)
+    if isinstance(distribution, tuple) and isinstance(distribution[0], str):
+        name, *parameters = distribution
+        if not hasattr(rng, name):
+            raise ValueError("Unknown distribution " + name)
+        parameters = [parameter if np.ndim(parameter) == 0 else np.asarray(parameter, dtype=float)[flights, np.newaxis]
+                      for parameter in parameters]
+        return getattr(rng, name)(*parameters, size=size)
+    values = np.asarray(distribution, dtype=float)
+    if values.ndim == 1:
+        return rng.choice(values, size=size)
+    values = values[flights]
+    return np.take_along_axis(values, rng.integers(values.shape[1], size=size), axis=1)
+
+
+# Parameters of the cost object flight with crew, maintenance and passengers scenario, exact values are kept
+def get_scenario_parameters(cost_object, scenario: str) -> dict:
+    parameters = {name: value for name, value in cost_object.params_dict["parameters"].items()
+                  if name in TACTICAL_DELAY_COSTS_PARAMETERS}
+    for name in ("crew_costs", "maintenance_costs"):
+        if type(parameters[name]) is not float:
+            parameters[name] = scenario
+    if type(parameters["passengers"]) is not int:
+        parameters["passengers"] = scenario
+    return parameters
+
+
+# Batch cost coefficients of the flights in each scenario: the rows of scenario code k are k * flights to
+# (k + 1) * flights, resolved with one batch call instead of building a cost object per flight and scenario
+def get_scenario_coefficients(cost_objects: list) -> pd.DataFrame:
+    return get_batch_cost_coefficients(pd.DataFrame([get_scenario_parameters(cost_object, scenario)
+                                                     for scenario in SCENARIOS for cost_object in cost_objects]))
+
+
+# Flights x samples costs of batch cost coefficients, hard and soft costs scaled by the sampled passengers load if any
+def get_sampled_batch_costs(coefficients: pd.DataFrame, delays: np.ndarray, loads: np.ndarray = None) -> np.ndarray:
+    components = evaluate_batch_cost_components(coefficients, delays)
+    passengers_costs = components["hard"] + components["soft"]
+    costs = passengers_costs if loads is None else loads * passengers_costs
+    for component in COST_COMPONENTS:
+        if component not in ("hard", "soft"):
+            costs += components[component]
+    return costs
+
+
+# Costs at the sampled delays, hard and soft costs scaled by the sampled passengers load if any
+def get_sampled_costs(cost_object, delays: np.ndarray, loads: np.ndarray = None) -> np.ndarray:
+    if loads is None:
+        return cost_object.evaluate(delays)
+    passengers_costs = get_sum_cost_function([cost_object.passengers_hard_costs_function,
+                                              cost_object.passengers_soft_costs_function])
+    other_costs = get_sum_cost_function([cost_object.total_crew_costs_function,
+                                         cost_object.total_maintenance_costs_function,
+                                         cost_object.curfew_costs_function,
+                                         cost_object.missed_connection_costs_function])
+    return other_costs(delays) + loads * passengers_costs(delays)
+
+
+def get_expected_costs(cost_objects, delay_distribution, samples: int = 2000, load_distribution=None,
+                       scenario_probabilities=None, quantiles=(.5, .9, .95, .99), seed=None) -> ExpectedCosts:
+    """Monte Carlo expected cost of delay of many flights under delay, passengers load and scenario uncertainty
+    Parameters:
+        cost_objects: Iterable[CostObject]
+            cost objects of the flights
+        delay_distribution: tuple | callable | array-like
+            delays in minutes, negative delays count as zero delay. Either a numpy Generator method with its
+            parameters e.g. ("lognormal", 3., .8) or ("gamma", 2., 15.), parameters are scalars or arrays
+            with one value per flight; a callable(rng, size) returning a flights x samples array;
+            empirical delays shared by all flights (1-D) or one row per flight (2-D), resampled with replacement
+        samples: int = 2000
+            samples per flight
+        load_distribution: tuple | callable | array-like = None
+            passengers number relative to the one of each cost object (1 = as costed), same forms of
+            delay_distribution e.g. ("normal", 1., .1). It scales the passengers hard and soft costs
+            (missed connection and curfew costs are kept). None means no load uncertainty
+        scenario_probabilities: array-like = None
+            probabilities of the low, base and high scenario of crew, maintenance and passengers costs
+            (exact values are kept), drawn for each sample (once for all the flights), the samples of each
+            scenario are costed with the batch path. None means the scenario of each cost object
+        quantiles: array-like = (.5, .9, .95, .99)
+            levels of the tail quantiles of the costs
+        seed: int | np.random.Generator = None
+            seed of the random generator, same seed same results
+
+        return: ExpectedCosts
+            mean, variance (one value per flight), quantiles (flights x quantile levels) in EUR,
+            quantile_levels and cost at the mean sampled delay of each flight for comparison
+        """
+    cost_objects = list(cost_objects)
+    rng = np.random.default_rng(seed)
+    quantile_levels = np.asarray(quantiles, dtype=float).reshape(-1)
+    number_of_flights = len(cost_objects)
+    chunk_size = max(1, MAX_CHUNK_COSTS // samples)
+    if scenario_probabilities is not None:
+        scenario_probabilities = np.asarray(scenario_probabilities, dtype=float)
+        if scenario_probabilities.shape != (len(SCENARIOS),) or (scenario_probabilities < 0).any():
+            raise ValueError("Scenario probabilities of the low, base and high scenario needed, got "
+                             + str(scenario_probabilities.tolist()))
+        scenario_probabilities = scenario_probabilities / scenario_probabilities.sum()
+        scenario_coefficients = get_scenario_coefficients(cost_objects)
+        # the cost components of a scenario are held in memory at once
+        chunk_size = max(1, chunk_size // len(COST_COMPONENTS))
+
+    mean = np.empty(number_of_flights)
+    variance = np.empty(number_of_flights)
+    quantile_values = np.empty((number_of_flights, quantile_levels.size))
+    cost_at_mean_delay = np.empty(number_of_flights)
+    for start in range(0, number_of_flights, chunk_size):
+        flights = slice(start, min(start + chunk_size, number_of_flights))
+        chunk_flights = flights.stop - flights.start
+        delays = np.maximum(get_samples(delay_distribution, rng, flights, chunk_flights, samples), 0.)
+        loads = (None if load_distribution is None
+                 else np.maximum(get_samples(load_distribution, rng, flights, chunk_flights, samples), 0.))
+        # the scenario of a sample is drawn once for all the flights of the chunk: the samples of each flight are
+        # still independent draws, and each scenario is costed only at its own samples
+        scenarios = (None if scenario_probabilities is None
+                     else rng.choice(len(SCENARIOS), size=samples, p=scenario_probabilities))
+        costs = np.empty((chunk_flights, samples))
+        if scenarios is None:
+            for row, cost_object in enumerate(cost_objects[flights]):
+                costs[row] = get_sampled_costs(cost_object, delays[row], None if loads is None else loads[row])
+        else:
+            for code in range(len(SCENARIOS)):
+                is_scenario = scenarios == code
+                if not is_scenario.any():
+                    continue
+                coefficients = scenario_coefficients.iloc[code * number_of_flights + flights.start:
+                                                          code * number_of_flights + flights.stop]
+                costs[:, is_scenario] = get_sampled_batch_costs(coefficients, delays[:, is_scenario],
+                                                                None if loads is None else loads[:, is_scenario])
+        mean[flights] = costs.mean(axis=1)
+        variance[flights] = costs.var(axis=1, ddof=1) if samples > 1 else 0.
+        quantile_values[flights] = np.quantile(costs, quantile_levels, axis=1).T
+        cost_at_mean_delay[flights] = [cost_object.cost_function(flight_delays.mean()) for cost_object, flight_delays
+                                       in zip(cost_objects[flights], delays)]
+    return ExpectedCosts(mean, variance, quantile_values, quantile_levels, cost_at_mean_delay)
@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class PiecewiseCostFunction:
+    def __init__(self, breakpoints, coefficients):
+        """Cost of delay as a piecewise polynomial function of delay
+
+        breakpoints: array-like
+            sorted delays in minutes at which the cost function changes, n breakpoints define n + 1 segments:
+            (-inf, breakpoints[0]), [breakpoints[0], breakpoints[1]), ..., [breakpoints[n - 1], inf)
+
+        coefficients: array-like
+            polynomial coefficients of each segment in increasing powers of delay, shape (n + 1, degree + 1):
+            cost(delay) = coefficients[i, 0] + coefficients[i, 1] * delay + coefficients[i, 2] * delay ** 2 ...
+            for delay in segment i
+
+        The function is evaluated with a binary search of the segment followed by Horner's scheme,
+        delay can be either a scalar or a numpy array of delays.
+        Functions can be added together and multiplied by a scalar, the result is exact
+        """
+        self.breakpoints = np.array(breakpoints, dtype=float).reshape(-1)
+        self.coefficients = np.array(coefficients, dtype=float).reshape(self.breakpoints.size + 1, -1)
+        if (self.breakpoints[1:] <= self.breakpoints[:-1]).any():
+            raise ValueError("Breakpoints of a piecewise cost function must be strictly increasing")
+        self.breakpoints.flags.writeable = False
+        self.coefficients.flags.writeable = False
+
+    @property
+    def degree(self) -> int:
+        return self.coefficients.shape[1] - 1
+
+    def __call__(self, delay):
+        delay = np.asarray(delay, dtype=float)
+        return get_polynomial_value(self.coefficients[np.searchsorted(self.breakpoints, delay, side='right')],
+                                    delay)[()]
+
+    # Derivative with respect to delay, at the breakpoints the derivative of the segment starting there
+    def derivative(self):
+        return PiecewiseCostFunction(self.breakpoints, self.coefficients[:, 1:] * np.arange(1, self.degree + 1)
+                                     if self.degree > 0 else np.zeros_like(self.coefficients))
+
+    # Right limit minus left limit of the function at each breakpoint, zero where the function is continuous
+    def get_jumps(self) -> np.ndarray:
+        return (get_polynomial_value(self.coefficients[1:], self.breakpoints)
+                - get_polynomial_value(self.coefficients[:-1], self.breakpoints))
+
+    # Same function without the breakpoints between segments with the same polynomial
+    def simplified(self):
+        changed = np.any(self.coefficients[1:] != self.coefficients[:-1], axis=1)
+        return PiecewiseCostFunction(self.breakpoints[changed],
+                                     self.coefficients[np.concatenate(([True], changed))])
+
+    def __add__(self, other):
+        if np.isscalar(other):
+            other = get_constant_cost_function(other)
+        if not isinstance(other, PiecewiseCostFunction):
+            return NotImplemented
+        return get_sum_cost_function((self, other))
+
+    # sum() starts from 0
+    __radd__ = __add__
+
+    def __mul__(self, factor: float):
+        if not np.isscalar(factor):
+            return NotImplemented
+        return PiecewiseCostFunction(self.breakpoints, self.coefficients * factor)
+
+    __rmul__ = __mul__
+
+    # Pickled as its arrays only, the constructor makes them read-only again on load
+    def __reduce__(self):
+        return PiecewiseCostFunction, (self.breakpoints, self.coefficients)
+
+    # Data-only representation, JSON compatible
+    def to_dict(self) -> dict:
+        return {"breakpoints": self.breakpoints.tolist(), "coefficients": self.coefficients.tolist()}
+
+    def __repr__(self):
+        return ("PiecewiseCostFunction(breakpoints=" + np.array2string(self.breakpoints, separator=", ")
+                + ", coefficients=" + np.array2string(self.coefficients, separator=", ") + ")")
+
+
+def get_cost_function_from_dict(data: dict) -> PiecewiseCostFunction:
+    return PiecewiseCostFunction(data["breakpoints"], data["coefficients"])
+
+
+# Horner's scheme, coefficients in increasing powers along the last axis
+def get_polynomial_value(coefficients: np.ndarray, delay):
+    values = coefficients[..., -1]
+    for power in range(coefficients.shape[-1] - 2, -1, -1):
+        values = values * delay + coefficients[..., power]
+    return values
+
+
+# Exact sum of many piecewise cost functions, the breakpoints of all the functions are merged at once
+def get_sum_cost_function(functions) -> PiecewiseCostFunction:
+    breakpoints = np.sort(np.concatenate([function.breakpoints for function in functions]))
+    unique = np.ones(breakpoints.size, dtype=bool)
+    unique[1:] = breakpoints[1:] != breakpoints[:-1]
+    breakpoints = breakpoints[unique]
+    # each segment of the sum is contained in one segment of every function, found from its start
+    starts = np.concatenate(([-np.inf], breakpoints))
+    coefficients = np.zeros((breakpoints.size + 1, max(function.degree for function in functions) + 1))
+    for function in functions:
+        if function.breakpoints.size == 0:
+            coefficients[:, :function.degree + 1] += function.coefficients[0]
+        else:
+            coefficients[:, :function.degree + 1] += function.coefficients[
+                np.searchsorted(function.breakpoints, starts, side='right')]
+    return PiecewiseCostFunction(breakpoints, coefficients)
+
+
+def get_constant_cost_function(value: float) -> PiecewiseCostFunction:
+    return PiecewiseCostFunction([], [[value]])
+
+
+# rate in EUR/min
+def get_linear_cost_function(rate: float) -> PiecewiseCostFunction:
+    return PiecewiseCostFunction([], [[0., rate]])
+
+
+# costs[i] from delays[i] (included) to delays[i + 1], zero before the first delay and costs[-1] after the last one
+def get_step_cost_function(delays, costs) -> PiecewiseCostFunction:
+    return PiecewiseCostFunction(delays, np.concatenate(([0.], costs))[:, np.newaxis])
+
+
+# factor * rate(delay) * delay, with rate linearly interpolated between the given delays,
+# linear from zero before the first delay and rates[-1] after the last one
+def get_interpolated_rate_cost_function(delays, rates, factor: float = 1.) -> PiecewiseCostFunction:
+    delays = np.asarray(delays, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    slopes = np.concatenate(([rates[0] / delays[0]], np.diff(rates) / np.diff(delays), [0.]))
+    intercepts = np.concatenate(([0.], rates)) - slopes * np.concatenate(([0.], delays))
+    return PiecewiseCostFunction(delays, factor * np.stack((np.zeros(delays.size + 1), intercepts, slopes), axis=1))
@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+
+from import_time import ROOT, RUNS, measure_cold_import
+
+sys.path.insert(0, ROOT)
+
+from CostPackage.Aircraft.aircraft_cluster import AIRCRAFT_CLUSTERING_FILE
+from CostPackage.Airport.airport import AIRPORTS_FILE, get_great_circle_distance
+from CostPackage.FlightPhase.flight_phase import FLIGHT_PHASES
+from CostPackage.ReferenceData.reference_data import get_csv_columns
+from CostPackage.TacticalDelayCosts.cost_cache import disable_cost_cache
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_tactical_delay_costs
+
+# Suite of benchmarks of the main paths of the package on a synthetic but realistic flight mix:
+# aircraft types of AircraftClustering.csv, airports of Airports.csv and great circle flight lengths.
+# Results are written to a json file, runs of different commits are compared with --compare
+
+# Delays of the evaluation benchmarks, in minutes
+DELAYS = np.arange(0, 601, 5, dtype=float)
+
+
+def get_flights(number: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    aircraft_types = get_csv_columns(AIRCRAFT_CLUSTERING_FILE)["AircraftType"]
+    airports = get_csv_columns(AIRPORTS_FILE)
+    # airports without ICAO code are listed as \N
+    airport_rows = np.flatnonzero(np.char.str_len(airports["ICAO"]) == 4)
+    icao = airports["ICAO"][airport_rows]
+
+    origin = rng.integers(icao.size, size=number)
+    destination = rng.integers(icao.size, size=number)
+    flight_length = get_great_circle_distance(airport_rows[origin], airport_rows[destination])
+
+    flights = []
+    for index in range(number):
+        passengers = (["low", "base", "high"][rng.integers(3)] if rng.random() < .5
+                      else int(rng.integers(50, 300)))
+        flights.append({
+            "aircraft_type": str(rng.choice(aircraft_types)),
+            "flight_phase_input": FLIGHT_PHASES[rng.integers(len(FLIGHT_PHASES))],
+            "passengers": passengers,
+            "is_low_cost_airline": bool(rng.random() < .3),
+            "flight_length": max(float(flight_length[index]), 100.),
+            "origin_airport": str(icao[origin[index]]),
+            "destination_airport": str(icao[destination[index]]),
+            "missed_connection_passengers": None
+        })
+    return flights
+
+
+# Missed connection passengers added to the flights with fixed passengers numbers
+def get_flights_with_missed_connections(flights: list[dict], seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [{**flight, "missed_connection_passengers": [
+        (float(rng.integers(30, 300)), float(rng.integers(60, 600))) for _ in range(rng.integers(1, 20))]}
+            if type(flight["passengers"]) is int else flight for flight in flights]
+
+
+# Median and 95th percentile of the per-call times in microseconds
+def get_latency(times: list[float]) -> dict:
+    times = np.array(times) * 1e6
+    return {"median_us": float(np.median(times)), "p95_us": float(np.percentile(times, 95)), "calls": times.size}
+
+
+def benchmark_cold_import() -> dict:
+    runs = [measure_cold_import() for _ in range(RUNS)]
+    return {"import_s": statistics.median(run[0] for run in runs),
+            "first_call_s": statistics.median(run[1] for run in runs),
+            "pandas_imported": any(run[2] for run in runs)}
+
+
+def benchmark_construction(flights: list[dict]) -> dict:
+    results = {}
+    for flight_phase in FLIGHT_PHASES:
+        times = []
+        for flight in flights:
+            if flight["flight_phase_input"] == flight_phase:
+                start = time.perf_counter()
+                get_tactical_delay_costs(**flight)
+                times.append(time.perf_counter() - start)
+        results[flight_phase] = get_latency(times)
+    return results
+
+
+# Scalar calls of the cost functions (optimizer style) and vectorized evaluation over DELAYS
+def benchmark_evaluation(flights: list[dict]) -> dict:
+    cost_objects = [get_tactical_delay_costs(**flight) for flight in flights]
+    start = time.perf_counter()
+    for cost_object in cost_objects:
+        for delay in DELAYS[::10]:
+            cost_object.cost_function(delay)
+    scalar_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for cost_object in cost_objects:
+        cost_object.evaluate(DELAYS)
+    vector_time = time.perf_counter() - start
+    return {"scalar_calls_per_s": len(cost_objects) * DELAYS[::10].size / scalar_time,
+            "vector_delays_per_s": len(cost_objects) * DELAYS.size / vector_time}
+
+
+def benchmark_batch(flights: list[dict]) -> dict:
+    import pandas as pd
+    from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_batch_cost_coefficients, \
+        evaluate_batch_costs
+
+    table = pd.DataFrame(flights)
+    start = time.perf_counter()
+    coefficients = get_batch_cost_coefficients(table)
+    coefficients_time = time.perf_counter() - start
+    start = time.perf_counter()
+    evaluate_batch_costs(coefficients, DELAYS)
+    evaluation_time = time.perf_counter() - start
+    return {"coefficients_flights_per_s": len(flights) / coefficients_time,
+            "evaluation_costs_per_s": len(flights) * DELAYS.size / evaluation_time}
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(number: int, seed: int, skip_import: bool = False) -> dict:
+    # cost objects are built every time, not served by the cost cache
+    disable_cost_cache()
+    flights = get_flights(number, seed)
+    flights_with_missed_connections = get_flights_with_missed_connections(flights, seed)
+    results = {}
+    if not skip_import:
+        results["cold_import"] = benchmark_cold_import()
+    # warm up: reference tables loaded before timing
+    get_tactical_delay_costs(**flights[0])
+    results["construction"] = benchmark_construction(flights)
+    results["construction_missed_connections"] = benchmark_construction(flights_with_missed_connections)
+    results["evaluation"] = benchmark_evaluation(flights)
+    results["evaluation_missed_connections"] = benchmark_evaluation(flights_with_missed_connections)
+    results["batch"] = benchmark_batch(flights)
+    results["batch_missed_connections"] = benchmark_batch(flights_with_missed_connections)
+    return {"commit": get_commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "numpy": np.__version__, "machine": platform.machine(), "flights": number, "seed": seed,
+            "results": results}
+
+
+# Flattened results e.g. {"construction.AT_GATE.median_us": 120.3}
+def get_metrics(results: dict, prefix: str = "") -> dict:
+    metrics = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            metrics.update(get_metrics(value, prefix + key + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[prefix + key] = value
+    return metrics
+
+
+def print_comparison(baseline: dict, current: dict):
+    print(f"{'metric':55} {baseline['commit'] or 'baseline':>14} {current['commit'] or 'current':>14}  ratio")
+    baseline_metrics = get_metrics(baseline["results"])
+    for metric, value in get_metrics(current["results"]).items():
+        if metric in baseline_metrics:
+            ratio = value / baseline_metrics[metric] if baseline_metrics[metric] else float("nan")
+            print(f"{metric:55} {baseline_metrics[metric]:14.4g} {value:14.4g} {ratio:6.2f}")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of import, construction, evaluation and batch paths")
+    parser.add_argument("-o", "--output", help="json results file, benchmarks/results/<commit>.json by default")
+    parser.add_argument("-n", "--flights", type=int, default=3000, help="number of synthetic flights")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the synthetic flight mix")
+    parser.add_argument("--skip-import", action="store_true", help="skip the cold import benchmark")
+    parser.add_argument("--compare", help="json results file of a previous run to compare with")
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(arguments.flights, arguments.seed, arguments.skip_import)
+    output = arguments.output or os.path.join(ROOT, "benchmarks", "results", (results["commit"] or "results")
+                                              + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print("results written to " + output)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            print_comparison(json.load(file), results)
+    else:
+        for metric, value in get_metrics(results["results"]).items():
+            print(f"{metric:55} {value:14.4g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import os
+import statistics
+import subprocess
+import sys
+
+# Cold import of the core evaluation path: import, build one cost object and evaluate it.
+# The budget is the median over fresh interpreters, numpy alone takes about 0.1 s on a laptop
+IMPORT_TIME_BUDGET = 0.25
+RUNS = 7
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_IMPORT = """
+import sys, time
+start = time.perf_counter()
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_tactical_delay_costs
+imported = time.perf_counter()
+get_tactical_delay_costs("A320", "AT_GATE", passengers="base", destination_airport="EGLL").evaluate([0, 60, 300])
+first_call = time.perf_counter()
+print(imported - start, first_call - imported, "pandas" in sys.modules)
+"""
+
+
+def measure_cold_import() -> tuple[float, float, bool]:
+    output = subprocess.run([sys.executable, "-c", COLD_IMPORT], cwd=ROOT, capture_output=True, text=True,
+                            check=True, env={**os.environ, "PYTHONPATH": ROOT}).stdout.split()
+    return float(output[0]), float(output[1]), output[2] == "True"
+
+
+def main() -> int:
+    runs = [measure_cold_import() for _ in range(RUNS)]
+    import_time = statistics.median(run[0] for run in runs)
+    first_call_time = statistics.median(run[1] for run in runs)
+    pandas_imported = any(run[2] for run in runs)
+    print(f"import: {import_time:.3f} s (budget {IMPORT_TIME_BUDGET:.3f} s), first call: {first_call_time:.3f} s, "
+          f"pandas imported: {pandas_imported}")
+    return 0 if import_time <= IMPORT_TIME_BUDGET and not pandas_imported else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
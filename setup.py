@@ -29,5 +29,9 @@ setup(
         "Programming Language :: Python :: 3.12",
         "Operating System :: Microsoft :: Windows :: Windows 11",
     ],
-    include_package_data=True
+    include_package_data=True,
+    entry_points={
+        "console_scripts": ["delaycost=CostPackage.command_line:main",
+                            "delaycost-service=CostPackage.cost_service:main"]
+    }
 )
\ No newline at end of file
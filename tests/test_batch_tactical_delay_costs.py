@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from CostPackage.TacticalDelayCosts.batch_tactical_delay_costs import get_tactical_delay_costs_batch
+from CostPackage.TacticalDelayCosts.tactical_delay_costs import get_tactical_delay_costs
+
+DELAYS = [0., 30., 100., 300.]
+
+
+# Arrow list columns come as object arrays of arrays, not lists of tuples
+def test_arrow_missed_connection_passengers():
+    pa = pytest.importorskip("pyarrow")
+    missed_connection_passengers = [[[60., 200.], [90., 300.]], None]
+    flights = pa.table({
+        "aircraft_type": ["A320", "A320"],
+        "flight_phase_input": ["AT_GATE", "AT_GATE"],
+        "passengers": [150, 150],
+        "flight_length": [1500., 1500.],
+        "missed_connection_passengers": missed_connection_passengers
+    })
+    costs = get_tactical_delay_costs_batch(flights, DELAYS)
+
+    for row, passengers in enumerate(missed_connection_passengers):
+        cost_object = get_tactical_delay_costs("A320", "AT_GATE", passengers=150, flight_length=1500.,
+                                               missed_connection_passengers=None if passengers is None
+                                               else [tuple(passenger) for passenger in passengers])
+        assert costs[row] == pytest.approx(np.array([cost_object.cost_function(delay) for delay in DELAYS]))
+    # passengers missing their connection at 100 minutes perceive 200 and 300 minutes
+    assert costs[0, 2] > costs[1, 2]
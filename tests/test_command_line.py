@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from CostPackage.command_line import main
+
+
+# Flights whose destination airport and scenarios are empty in the first chunks and set in the later ones
+def get_flights() -> pd.DataFrame:
+    return pd.DataFrame({
+        "aircraft_type": ["A320"] * 12,
+        "flight_phase_input": ["AT_GATE"] * 12,
+        "passengers": [150] * 5 + ["HighScenario"] * 7,
+        "flight_length": [500.] * 12,
+        "destination_airport": [None] * 5 + ["EGLL"] * 7,
+        "missed_connection_passengers": [None] * 7 + [[(60, 200)]] * 5
+    })
+
+
+def write_flights(flights: pd.DataFrame, path) -> None:
+    if path.suffix == ".csv":
+        flights.to_csv(path, index=False)
+    else:
+        flights.to_json(path, orient="records", lines=True)
+
+
+@pytest.mark.parametrize("input_extension", [".csv", ".jsonl"])
+def test_parquet_output_of_columns_empty_in_the_first_chunks(tmp_path, input_extension):
+    pytest.importorskip("pyarrow")
+    flights = get_flights()
+    write_flights(flights, tmp_path / ("flights" + input_extension))
+    assert main([str(tmp_path / ("flights" + input_extension)), str(tmp_path / "costs.parquet"),
+                 "-d", "0,30,90", "-c", "5"]) == 0
+    assert main([str(tmp_path / ("flights" + input_extension)), str(tmp_path / "costs.csv"),
+                 "-d", "0,30,90", "-c", "12"]) == 0
+
+    costs = pd.read_parquet(tmp_path / "costs.parquet")
+    assert len(costs) == len(flights)
+    assert costs["destination_airport"].isna().sum() == 5
+    assert (costs["destination_airport"].iloc[5:] == "EGLL").all()
+    # same costs as with all the flights in one chunk
+    single_chunk_costs = pd.read_csv(tmp_path / "costs.csv")
+    for column in ["cost_0", "cost_30", "cost_90"]:
+        assert costs[column].to_numpy() == pytest.approx(single_chunk_costs[column].to_numpy())